@@ -1,25 +1,54 @@
+import time
+
+# Taken first so startup timings include our own imports
+_module_start = time.perf_counter()
+
 import os
 import sys
 import shutil
+import tempfile
 import re
-import win32com.client
-import win32com
-from docx import Document
-import openpyxl
-from openpyxl.styles import PatternFill, Font, Alignment
-from docx.shared import Pt
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+import bisect
+import heapq
+from collections import Counter
+import string
+import fnmatch
+# win32com, docx and openpyxl are imported where they are used, so menu paths that don't need them start faster
 from datetime import date, datetime
 import configparser
 import platform
+import sqlite3
+import json
+import csv
+import hashlib
+import uuid
+import statistics
+import threading
+import socket
+import socketserver
+import io
+import zipfile
+import copy
+import posixpath
+import xml.etree.ElementTree as ElementTree
+import html
+import multiprocessing
+import atexit
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Determine the paths based on execution context
 if getattr(sys, 'frozen', False):
     config_path = os.path.join(sys._MEIPASS, 'config.ini')
     email_body_path = os.path.join(sys._MEIPASS, 'email_body.html')
+    psar_email_body_path = os.path.join(sys._MEIPASS, 'PSAR_email_body.html')
+    cloud_ir_email_body_path = os.path.join(sys._MEIPASS, 'Cloud_IR_email_body.html')
 else:
     config_path = 'config.ini'
     email_body_path = 'email_body.html'
+    psar_email_body_path = 'PSAR_email_body.html'
+    cloud_ir_email_body_path = 'Cloud_IR_email_body.html'
 
 # Load and read the configuration file
 config = configparser.ConfigParser()
@@ -30,18 +59,173 @@ BASE_DIRECTORY = os.path.join(config['Paths']['base_directory'])
 WORKBOOK_PATH = os.path.join(config['Paths']['workbook_path'])
 EMAIL_TEMPLATE = os.path.join(config['Paths']['email_template'])
 EMAIL_BODY = os.path.join(config['Paths']['email_body'])
+PSAR_EMAIL_TEMPLATE = config.get('Paths', 'design_complete_PSAR_email_template', fallback='')
+CLOUD_IR_EMAIL_TEMPLATE = config.get('Paths', 'design_complete_Cloud_IR_email_template', fallback='')
 SHARED_MAILBOX_EMAIL = config['Settings']['shared_mailbox_email']
+LOCAL_CALENDAR_DIRECTORY = config.get('Settings', 'local_calendar_directory', fallback='')  # Stand-in for the shared calendar when set
 ON_PREM_VISIO_TEMPLATE = os.path.join(config['Paths']['on_prem_visio_template'])
 OFF_PREM_VISIO_TEMPLATE = os.path.join(config['Paths']['off_prem_visio_template'])
 
+# Local cache for the search index (kept off the synced share)
+CACHE_DIRECTORY = config.get('Paths', 'cache_directory', fallback=os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'Project_MASTER'))
+SEARCH_INDEX_PATH = os.path.join(CACHE_DIRECTORY, 'search_index.sqlite3')
+PROJECT_CATALOG_PATH = os.path.join(CACHE_DIRECTORY, 'project_catalog.json')
+ANALYTICS_DIRECTORY = os.path.join(CACHE_DIRECTORY, 'analytics')  # Typed columnar export of Yes/Done for --report
+INDEX_REFRESH_INTERVAL = config.getint('Settings', 'index_refresh_interval', fallback=300)  # Seconds between full incremental refreshes; new project folders show up at once
+SCAN_WORKERS = config.getint('Settings', 'scan_workers', fallback=16)  # Folders listed at once; the share's latency is what they wait on
+SCAN_MAX_DEPTH = config.getint('Settings', 'scan_max_depth', fallback=-1)  # Levels below the search root to descend, -1 for all
+# Folder names (fnmatch patterns, any case) the directory search never descends into; the blob store is always skipped
+SCAN_PRUNE_PATTERNS = ['.blobstore'] + [pattern.strip() for pattern in config.get('Settings', 'scan_prune_patterns', fallback='').split(',') if pattern.strip()]
+
+# Spreadsheet search: 'snapshot' reads the cached snapshot, 'streaming' always scans the xlsx
+SPREADSHEET_SEARCH_MODE = config.get('Settings', 'spreadsheet_search_mode', fallback='snapshot')
+SHEET_WORKERS = config.getint('Settings', 'sheet_workers', fallback=4)  # Processes used to scan sheets in parallel
+SHEET_MEMORY_LIMIT_MB = config.getint('Settings', 'sheet_memory_limit_mb', fallback=256)  # Per-sheet limit on a worker's memory growth, 0 disables it
+PIPELINE_WORKERS = config.getint('Settings', 'pipeline_workers', fallback=4)  # Threads building project folders in a batch
+RELOCATE_WORKERS = config.getint('Settings', 'relocate_workers', fallback=8)  # Parallel file copies when a folder move has to copy
+ATTACHMENT_WORKERS = config.getint('Settings', 'attachment_workers', fallback=4)  # Threads copying saved attachments to the share
+USE_BLOB_STORE = config.getboolean('Settings', 'blob_store', fallback=True)  # Share identical files through BLOB_STORE_DIRECTORY
+BLOB_STORE_DIRECTORY = os.path.join(BASE_DIRECTORY, '.blobstore')
+JOURNAL_COMPACT_INTERVAL = config.getint('Settings', 'journal_compact_interval', fallback=30)  # Seconds between workbook compactions
+JOURNAL_COMPACT_ENTRIES = config.getint('Settings', 'journal_compact_entries', fallback=50)  # Compact early once this many changes are pending
+JOURNAL_LOCK_TIMEOUT = config.getint('Settings', 'journal_lock_timeout', fallback=60)  # Seconds to wait for another process's journal lock
+JOURNAL_LOCK_STALE = config.getint('Settings', 'journal_lock_stale', fallback=300)  # A lock file this old was left by a crashed run
+COORDINATOR_HOST = config.get('Settings', 'coordinator_host', fallback='127.0.0.1')  # Where --coordinator listens and clients look for it
+COORDINATOR_PORT = config.getint('Settings', 'coordinator_port', fallback=48650)
+COORDINATOR_BATCH_WINDOW = config.getfloat('Settings', 'coordinator_batch_window', fallback=2.0)  # Seconds the coordinator gathers changes into one save
+COORDINATOR_TIMEOUT = 2  # Seconds to wait for a coordinator to accept the connection before journaling locally
+COORDINATOR_REPLY_TIMEOUT = config.getint('Settings', 'coordinator_reply_timeout', fallback=120)  # Seconds to wait for its answer, which can be behind a full save
+
+
+# --profile: time every stage as a Chrome trace span and keep a latency histogram per Outlook COM call.
+# Open the trace file written at exit in chrome://tracing or https://ui.perfetto.dev
+PROFILE_ENABLED = "--profile" in sys.argv[1:]
+COM_HISTOGRAM_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+_trace_events = []
+_com_call_times = {}  # COM call name -> [seconds]
+_trace_lock = threading.Lock()
+
+
+def _record_span(name, category, start, args=None):
+    """Add a complete ('X') event that started at the given perf_counter time and return its duration."""
+    duration = time.perf_counter() - start
+    event = {'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+             'ts': round((start - _module_start) * 1e6), 'dur': round(duration * 1e6)}
+    if args:
+        event['args'] = {key: str(value) for key, value in args.items()}
+    with _trace_lock:
+        _trace_events.append(event)
+    return duration
+
+
+@contextmanager
+def trace_span(name, category='stage', **args):
+    """Record the with-block as one span of the profile trace. Does nothing unless --profile is set."""
+    if not PROFILE_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_span(name, category, start, args)
+
 
-def create_folder_and_docx(folder_path, docx_title, lsar_date=None, is_lsar=False):
+def traced(function):
+    """Decorator form of trace_span, named after the function."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with trace_span(function.__name__):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+def _record_com_call(name, start):
+    duration = _record_span(name, 'com', start)
+    with _trace_lock:
+        _com_call_times.setdefault(name, []).append(duration)
+
+
+def com_call(com_object, method_path, *args):
+    """Call a COM method by (dotted) name, e.g. com_call(mail_item, 'Attachments.Add', path), timing it under --profile."""
+    start = time.perf_counter()
     try:
-        # Create the folder
-        os.makedirs(folder_path, exist_ok=True)
+        method = com_object
+        for part in method_path.split('.'):
+            method = getattr(method, part)
+        return method(*args)
+    finally:
+        if PROFILE_ENABLED:
+            _record_com_call(method_path, start)
+
+
+def com_set(com_object, property_name, value):
+    """Set a COM property, timing it under --profile like com_call."""
+    start = time.perf_counter()
+    try:
+        setattr(com_object, property_name, value)
+    finally:
+        if PROFILE_ENABLED:
+            _record_com_call(f"{property_name} (set)", start)
+
+
+def com_latency_summary():
+    """Count, total and percentiles plus a bucketed histogram (upper bound in ms -> calls) for each COM call."""
+    summary = {}
+    for name, durations in sorted(_com_call_times.items()):
+        durations_ms = sorted(duration * 1000 for duration in durations)
+        counts = [0] * (len(COM_HISTOGRAM_BUCKETS_MS) + 1)
+        for ms in durations_ms:
+            counts[bisect.bisect_left(COM_HISTOGRAM_BUCKETS_MS, ms)] += 1
+        labels = [f"<={bound}ms" for bound in COM_HISTOGRAM_BUCKETS_MS] + [f">{COM_HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        summary[name] = {
+            'count': len(durations_ms),
+            'total_ms': round(sum(durations_ms), 3),
+            'p50_ms': round(durations_ms[len(durations_ms) // 2], 3),
+            'p95_ms': round(durations_ms[min(len(durations_ms) - 1, int(len(durations_ms) * 0.95))], 3),
+            'max_ms': round(durations_ms[-1], 3),
+            'histogram': dict(zip(labels, counts)),
+        }
+    return summary
+
+
+def write_profile_trace():
+    """Write the collected spans as a Chrome trace JSON file in the cache directory and print the COM call summary."""
+    if not _trace_events:
+        return
+    com_summary = com_latency_summary()
+    if com_summary:
+        print(f"\n{'COM call':<28}{'Count':>7}{'Total (ms)':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Max (ms)':>10}")
+        for name, stats in com_summary.items():
+            print(f"{name:<28}{stats['count']:>7}{stats['total_ms']:>12.1f}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+
+    trace_path = os.path.join(CACHE_DIRECTORY, 'traces', f"trace-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.json")
+    try:
+        os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': _trace_events, 'displayTimeUnit': 'ms', 'otherData': {'com_calls': com_summary}}, file)
+        print(f"Profile trace written to '{trace_path}'")
+    except OSError as e:
+        print(f"Could not write profile trace: {e}")
+
+
+# Styled STATUS_SHEET document, built once per run and stamped for each project
+_status_sheet_template = None
+STATUS_SHEET_DATE_MARKER = '@@STATUS_DATE@@'
+STATUS_SHEET_TEXT_MARKER = '@@STATUS_TEXT@@'
+
+
+def get_status_sheet_template():
+    """Return (package bytes without word/document.xml, document.xml bytes with markers) for the STATUS_SHEET docx.
+
+    The styles parts are most of the package, so they are compressed once here and reused as-is.
+    """
+    global _status_sheet_template
+    if _status_sheet_template is None:
+        from docx import Document
+        from docx.shared import Pt
+        from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 
-        # Create a docx file with the specified title
-        docx_file_path = os.path.join(folder_path, f'{docx_title}.docx')
         doc = Document()
 
         # Set the default font to Arial 12 for the entire document
@@ -53,84 +237,433 @@ def create_folder_and_docx(folder_path, docx_title, lsar_date=None, is_lsar=Fals
         # Create a paragraph for the default text
         p = doc.add_paragraph()
         p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT  # Set paragraph alignment to left
+        run = p.add_run(STATUS_SHEET_DATE_MARKER)
+        run.bold = True
+        p.add_run(STATUS_SHEET_TEXT_MARKER)
+
+        document_buffer = io.BytesIO()
+        doc.save(document_buffer)
+
+        base_buffer = io.BytesIO()
+        with zipfile.ZipFile(document_buffer) as package, zipfile.ZipFile(base_buffer, 'w', zipfile.ZIP_DEFLATED) as base:
+            for item in package.infolist():
+                if item.filename == 'word/document.xml':
+                    document_xml = package.read(item.filename)
+                else:
+                    base.writestr(item, package.read(item.filename))
+
+        _status_sheet_template = (base_buffer.getvalue(), document_xml)
+    return _status_sheet_template
+
+
+def write_status_sheet(docx_file_path, date_text, status_text):
+    """Write a STATUS_SHEET docx: the prebuilt package plus document.xml with the date and status stamped in."""
+    base_package, document_xml = get_status_sheet_template()
+    document_xml = document_xml.replace(STATUS_SHEET_DATE_MARKER.encode(), html.escape(date_text, quote=False).encode('utf-8'))
+    document_xml = document_xml.replace(STATUS_SHEET_TEXT_MARKER.encode(), html.escape(status_text, quote=False).encode('utf-8'))
+
+    buffer = io.BytesIO(base_package)
+    with zipfile.ZipFile(buffer, 'a', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('word/document.xml', document_xml)
+
+    with open(docx_file_path, 'wb') as docx_file:
+        docx_file.write(buffer.getvalue())
+
+
+def create_folder_and_docx(folder_path, docx_title, lsar_date=None, is_lsar=False):
+    try:
+        # Create the folder
+        os.makedirs(folder_path, exist_ok=True)
+
+        # Create a docx file with the specified title
+        docx_file_path = os.path.join(folder_path, f'{docx_title}.docx')
 
         if is_lsar:  # If project is starting from LSAR
             if lsar_date:  # If LSAR date is provided
-                # Convert lsar_date to string before appending
-                run = p.add_run(lsar_date.strftime("%m/%d/%Y"))
-                run.bold = True
-                p.add_run(" - LSAR held; welcome packet sent.")
+                write_status_sheet(docx_file_path, lsar_date.strftime("%m/%d/%Y"), " - LSAR held; welcome packet sent.")
+            else:
+                write_status_sheet(docx_file_path, "", "")
         else:  # For Validated Design
             today = date.today().strftime("%m/%d/%Y")
-            run = p.add_run(today)
-            run.bold = True
-            p.add_run(" - Project entered into system at the design phase.")
-
-        doc.save(docx_file_path)
+            write_status_sheet(docx_file_path, today, " - Project entered into system at the design phase.")
 
         return docx_file_path
     except Exception as e:
         print(f"An error occurred: {str(e)}")
 
 
-def download_attachments_from_calendar(shared_calendar, attachment_dir, lsar_date):
-    appts = shared_calendar.Items
-    appts.Sort("[Start]")
-    appts.IncludeRecurrences = "True"
+class OutlookCalendar:
+    """Calendar backend over the shared mailbox's Outlook calendar folder."""
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def appointments_between(self, start, end):
+        appts = self.folder.Items
+        com_call(appts, 'Sort', "[Start]")
+        appts.IncludeRecurrences = "True"
+
+        filter_str = "[Start] >= '" + start.strftime("%m/%d/%Y %I:%M %p") + "' AND [End] <= '" + end.strftime("%m/%d/%Y %I:%M %p") + "'"
+        restricted = com_call(appts, 'Restrict', filter_str)
+        with trace_span('list appointments', 'com'):
+            return list(restricted)
+
+
+class LocalAttachment:
+    """A file standing in for an Outlook attachment."""
+
+    def __init__(self, path):
+        self.path = path
+        self.FileName = os.path.basename(path)
+        self.Type = 1  # olByValue
+        self.Size = os.path.getsize(path)
 
-    filter_str = "[Start] >= '" + lsar_date.strftime("%m/%d/%Y") + " 08:00 AM' AND [End] <= '" + lsar_date.strftime("%m/%d/%Y") + " 04:00 PM'"
-    selected_appts = appts.Restrict(filter_str)
+    def SaveAsFile(self, destination):
+        shutil.copyfile(self.path, destination)
 
+
+class LocalAppointment:
+    def __init__(self, subject, start, end, attachments):
+        self.Subject = subject
+        self.Start = start
+        self.End = end
+        self.Attachments = attachments
+
+
+class LocalCalendar:
+    """Stand-in calendar backend for testing without Outlook.
+
+    Reads appointments.json from a folder: a list of {"subject", "start", "end", "attachments"} where
+    start/end are ISO datetimes and attachments are file names inside the same folder.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def appointments_between(self, start, end):
+        with open(os.path.join(self.directory, 'appointments.json'), 'r', encoding='utf-8') as file:
+            records = json.load(file)
+
+        appointments = []
+        for record in records:
+            appt_start = datetime.fromisoformat(record['start'])
+            appt_end = datetime.fromisoformat(record['end'])
+            if appt_start >= start and appt_end <= end:
+                attachments = [LocalAttachment(os.path.join(self.directory, name)) for name in record.get('attachments', [])]
+                appointments.append(LocalAppointment(record['subject'], appt_start, appt_end, attachments))
+        return appointments
+
+
+# Outlook handles, created on first use by get_outlook / get_shared_calendar
+_outlook_session = {}
+_outlook_warmup = None
+
+
+def warm_up_outlook():
+    """Start Outlook and load the MAPI profile on a background thread while the user answers prompts.
+
+    COM objects can only be used on the thread that created them, so this thread just gets the Outlook
+    server running and drops its handles; get_outlook then connects to the running server quickly.
+    """
+    global _outlook_warmup
+    if _outlook_warmup is not None or 'application' in _outlook_session:
+        return
+
+    def warm():
+        try:
+            import pythoncom
+            import win32com.client
+            pythoncom.CoInitialize()
+            try:
+                win32com.client.Dispatch('Outlook.Application').GetNamespace("MAPI")
+            finally:
+                pythoncom.CoUninitialize()
+        except Exception:
+            pass  # get_outlook will report the problem when it is actually needed
+
+    _outlook_warmup = threading.Thread(target=warm, daemon=True)
+    _outlook_warmup.start()
+
+
+def get_outlook():
+    """Return the Outlook.Application object, connecting on first use."""
+    if 'application' not in _outlook_session:
+        if _outlook_warmup is not None:
+            _outlook_warmup.join()
+        import win32com.client
+        _outlook_session['application'] = com_call(win32com.client, 'Dispatch', 'Outlook.Application')
+    return _outlook_session['application']
+
+
+def get_shared_calendar():
+    """Return the calendar backend for the shared mailbox, resolving it on first use."""
+    if 'calendar' not in _outlook_session:
+        if LOCAL_CALENDAR_DIRECTORY:
+            _outlook_session['calendar'] = LocalCalendar(LOCAL_CALENDAR_DIRECTORY)
+        else:
+            namespace = com_call(get_outlook(), 'GetNamespace', "MAPI")
+            recipient = com_call(namespace, 'CreateRecipient', SHARED_MAILBOX_EMAIL)
+            _outlook_session['calendar'] = OutlookCalendar(com_call(namespace, 'GetSharedDefaultFolder', recipient, 9))
+    return _outlook_session['calendar']
+
+
+# LSAR appointments already fetched from the calendar, by meeting day
+calendar_cache = {}
+
+
+def _lsar_window(day):
+    """LSAR meetings are held between 8am and 4pm."""
+    return datetime.combine(day, datetime.min.time()).replace(hour=8), datetime.combine(day, datetime.min.time()).replace(hour=16)
+
+
+@traced
+def prefetch_lsar_appointments(calendar, lsar_dates):
+    """Fetch the LSAR appointments for every date of a batch with a single calendar query."""
+    days = sorted({lsar_date.date() if isinstance(lsar_date, datetime) else lsar_date for lsar_date in lsar_dates} - set(calendar_cache))
+    if not days:
+        return
+
+    range_start, _ = _lsar_window(days[0])
+    _, range_end = _lsar_window(days[-1])
+    for day in days:
+        calendar_cache[day] = []
+
+    for appt in calendar.appointments_between(range_start, range_end):
+        if "lsar" not in appt.Subject.strip().lower():
+            continue
+
+        # Outlook hands back local wall-clock times tagged with a timezone; compare them as naive datetimes
+        appt_start = appt.Start.replace(tzinfo=None)
+        appt_end = appt.End.replace(tzinfo=None)
+        day = appt_start.date()
+        if day in calendar_cache:
+            window_start, window_end = _lsar_window(day)
+            if appt_start >= window_start and appt_end <= window_end:
+                calendar_cache[day].append(appt)
+
+    print(f"Fetched LSAR meetings for {len(days)} day(s) from {days[0]} to {days[-1]} in one calendar query.")
+
+
+def get_lsar_appointments(calendar, lsar_date):
+    """Return the LSAR appointments on lsar_date, querying the calendar only if that day is not cached yet."""
+    prefetch_lsar_appointments(calendar, [lsar_date])
+    return calendar_cache[lsar_date.date()]
+
+
+def _copy_attachment(temp_path, destination):
+    """Copy an attachment saved locally to its project folder, unless an identical file is already there.
+
+    Runs on the attachment pool. Returns (copied, size in bytes, seconds) and always removes temp_path.
+    """
+    start = time.perf_counter()
+    try:
+        size = os.path.getsize(temp_path)
+        try:
+            if os.path.getsize(destination) == size and hash_file(destination) == hash_file(temp_path):
+                return False, size, time.perf_counter() - start
+        except FileNotFoundError:
+            pass
+        place_file(temp_path, destination)
+        return True, size, time.perf_counter() - start
+    finally:
+        try:
+            os.remove(temp_path)
+        except PermissionError:
+            _remove_read_only(os.remove, temp_path, None)  # Windows won't delete a file left read-only
+
+
+@traced
+def download_attachments_from_calendar(appointments, attachment_dir, lsar_date):
+    """Save the meetings' non-image attachments to attachment_dir, skipping any already there.
+
+    Attachments are saved with SaveAsFile, which has to stay on this (the COM) thread, into a local temp folder;
+    copying them to the share, or finding an identical copy there by hash, happens on ATTACHMENT_WORKERS threads
+    meanwhile. Outlook's Attachment.Size includes MAPI overhead, so it can't tell an existing copy apart.
+    """
     image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tif', '.tiff']
 
-    if not selected_appts:
+    if not appointments:
         print(f"No meetings found for {lsar_date}.")
-    else:
-        os.makedirs(attachment_dir, exist_ok=True)
-        attachments_found = False
+        return
+
+    os.makedirs(attachment_dir, exist_ok=True)
+    start = time.perf_counter()
+    temp_dir = tempfile.mkdtemp(prefix='Project_MASTER-attachments-')
+    skipped = []  # sizes of attachments whose identical copy is already in attachment_dir
+    copies = []
 
-        for a in selected_appts:
-            if "lsar" in a.Subject.strip().lower():
+    try:
+        with ThreadPoolExecutor(max_workers=ATTACHMENT_WORKERS) as pool:
+            for a in appointments:
                 for attachment in a.Attachments:
-                    if attachment.Type == 1 and not any(attachment.FileName.lower().endswith(ext) for ext in image_extensions):
-                        attachment_filename = os.path.join(attachment_dir, attachment.FileName)
-                        try:
-                            attachment.SaveAsFile(attachment_filename)
-                            print(f"Downloaded attachment: {attachment_filename}")
-                            attachments_found = True
-                        except Exception as e:
-                            print(f"Error saving attachment: {e}")
-
-        if attachments_found:
-            print(f"Attachments downloaded to the directory: {attachment_dir}")
-        else:
-            print(f"No attachments found for meetings on {lsar_date}.")
+                    if attachment.Type != 1 or any(attachment.FileName.lower().endswith(ext) for ext in image_extensions):
+                        continue
+
+                    attachment_filename = os.path.join(attachment_dir, attachment.FileName)
+                    temp_path = os.path.join(temp_dir, f"{len(copies)}-{attachment.FileName}")
+                    try:
+                        com_call(attachment, 'SaveAsFile', temp_path)
+                    except Exception as e:
+                        print(f"Error saving attachment: {e}")
+                        continue
+                    copies.append((attachment_filename, pool.submit(_copy_attachment, temp_path, attachment_filename)))
+
+            downloaded = []  # (size, seconds to copy to the share)
+            copy_seconds = 0
+            for attachment_filename, future in copies:
+                try:
+                    copied, size, seconds = future.result()
+                except Exception as e:
+                    print(f"Error saving attachment: {e}")
+                    continue
+                copy_seconds += seconds
+                if copied:
+                    print(f"Downloaded attachment: {attachment_filename}")
+                    downloaded.append((size, seconds))
+                else:
+                    print(f"Already downloaded: {attachment_filename}")
+                    skipped.append(size)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if downloaded:
+        print(f"Attachments downloaded to the directory: {attachment_dir}")
+    elif not skipped:
+        print(f"No attachments found for meetings on {lsar_date}.")
+        return
+
+    downloaded_bytes = sum(size for size, _ in downloaded)
+    summary = f"Attachments for {lsar_date}: {len(downloaded)} downloaded ({downloaded_bytes / (1024 * 1024):.1f} MB) in {time.perf_counter() - start:.2f}s"
+    if copies:
+        summary += f" ({copy_seconds:.2f}s of it checking and copying on the share, alongside the Outlook saves)"
+    if skipped:
+        summary += f"; {len(skipped)} already present, {sum(skipped) / (1024 * 1024):.1f} MB not copied to the share again"
+        if downloaded_bytes:
+            # At the rate this run's copies went
+            seconds_per_byte = sum(seconds for _, seconds in downloaded) / downloaded_bytes
+            summary += f" (about {sum(skipped) * seconds_per_byte:.1f}s saved)"
+    print(summary + ".")
+
+
+# Outlook template, HTML body and subject format for every email the script produces.
+# The subject format is applied to the subject already in the .oft file.
+EMAIL_TEMPLATES = {
+    'lsar': {
+        'oft': EMAIL_TEMPLATE,
+        'body_path': email_body_path,
+        'subject': '{template_subject} - {agency_division} - {project_name}',
+    },
+    'psar': {
+        'oft': PSAR_EMAIL_TEMPLATE,
+        'body_path': psar_email_body_path,
+        'subject': '{template_subject} - {agency_division} - {project_name}',
+    },
+    'cloud_ir': {
+        'oft': CLOUD_IR_EMAIL_TEMPLATE,
+        'body_path': cloud_ir_email_body_path,
+        'subject': '{template_subject} - {agency_division} - {project_name}',
+    },
+}
+EMAIL_BODY_FIELDS = {'agency_name', 'project_name'}
+EMAIL_SUBJECT_FIELDS = {'template_subject', 'agency_division', 'project_name'}
+
+# Compiled bodies by template name: (mtime, [(literal text, field name or None), ...])
+_compiled_email_bodies = {}
+# Compiled subjects by template name; they only change with the code
+_compiled_email_subjects = {}
+
+
+def compile_email_template(text, allowed_fields, source):
+    """Split a str.format template into (literal, field) parts, rejecting anything render_email_template can't fill."""
+    parts = []
+    try:
+        for literal, field, format_spec, conversion in string.Formatter().parse(text):
+            if field is not None and (field not in allowed_fields or format_spec or conversion):
+                raise ValueError(f"unsupported placeholder '{{{field}}}'")
+            parts.append((literal, field))
+    except ValueError as e:
+        raise ValueError(f"Email template {source} is invalid: {e}") from None
+    return parts
+
+
+def render_email_template(parts, values):
+    return ''.join(literal + (str(values[field]) if field is not None else '') for literal, field in parts)
+
+
+def get_email_body_parts(name):
+    """Return the compiled HTML body for a template, re-reading the file only when its mtime changes."""
+    body_path = EMAIL_TEMPLATES[name]['body_path']
+    mtime = os.stat(body_path).st_mtime
+    cached = _compiled_email_bodies.get(name)
+    if cached is None or cached[0] != mtime:
+        with open(body_path, 'r', encoding='utf-8') as file:
+            cached = (mtime, compile_email_template(file.read(), EMAIL_BODY_FIELDS, body_path))
+        _compiled_email_bodies[name] = cached
+    return cached[1]
+
+
+def get_email_subject_parts(name):
+    """Return the compiled subject for a template, compiling it the first time it is asked for."""
+    if name not in _compiled_email_subjects:
+        _compiled_email_subjects[name] = compile_email_template(EMAIL_TEMPLATES[name]['subject'], EMAIL_SUBJECT_FIELDS, f"subject for '{name}'")
+    return _compiled_email_subjects[name]
+
+
+def load_email_templates():
+    """Compile and check every email template up front; returns the names that are ready to use."""
+    ready = []
+    for name, template in EMAIL_TEMPLATES.items():
+        try:
+            get_email_body_parts(name)
+            get_email_subject_parts(name)
+            if not template['oft']:
+                raise ValueError("no Outlook template (.oft) configured")
+            ready.append(name)
+        except (OSError, ValueError) as e:
+            print(f"Email template '{name}' unavailable: {e}")
+    return ready
+
+
+def render_email_body(name, agency_name, project_name):
+    return render_email_template(get_email_body_parts(name), {'agency_name': agency_name, 'project_name': project_name})
+
+
+def render_email_subject(name, template_subject, agency_division, project_name):
+    return render_email_template(get_email_subject_parts(name), {'template_subject': template_subject, 'agency_division': agency_division, 'project_name': project_name})
 
 
 def get_email_body_from_template(agency_name, project_name, original_project_name):
-    global email_body_path  # This is to clarify that we're using the global variable, though not strictly needed here
-    with open(email_body_path, 'r') as file:
-        email_content = file.read()  # Use a different variable name here
+    return render_email_body('lsar', agency_name, original_project_name)
 
-    return email_content.format(agency_name=agency_name, project_name=original_project_name)
 
+@traced
+def search_and_select_project(base_directory, action="close", multiple=False):
+    """Let the user pick a project folder under Active Projects by keyword.
 
-def search_and_select_project(base_directory):
+    With multiple=True the user may enter several numbers separated by commas (or 'all'), and a list of paths is returned.
+    """
     try:
         # Prompt the user to enter a keyword
-        keyword = input(
+        keyword = timed_input(
             "Enter a keyword to search for a project: ").lower()  # Convert the keyword to lowercase for case-insensitive search
 
-        # Search for project folders containing the keyword
-        matching_projects = []
-        for root, dirs, _ in os.walk(os.path.join(base_directory, "Active Projects")):
-            for dir_name in dirs:
-                if keyword in dir_name.lower():  # Convert folder name to lowercase for case-insensitive comparison
-                    matching_projects.append(dir_name)
+        # Rank the project folders by how closely their names match the keyword; only their names are candidates,
+        # so nothing inside them is listed
+        active_projects = os.path.join(base_directory, "Active Projects")
+        project_names = []
+        for _, _, (subfolder_names, _) in scan_tree(active_projects, max_depth=0):
+            project_names = subfolder_names
+        matching_projects = rank_names(keyword, project_names)
+
+        # Every folder containing the keyword is offered (and is what 'all' means); names that are only
+        # similar to it are listed when nothing contains it, for typos
+        containing = [name for name in matching_projects if compact_name(keyword) in compact_name(name)]
+        if containing:
+            matching_projects = containing
 
         if not matching_projects:
             print(f"No projects found matching the keyword '{keyword}'.")
-            return None
+            return [] if multiple else None
 
         # Display search results with numbers for selection
         print("Search results:")
@@ -140,10 +673,15 @@ def search_and_select_project(base_directory):
         # Prompt user to select a project by number
         while True:
             try:
-                selection = int(input("Enter the number of the project you want to close: "))
-                if 1 <= selection <= len(matching_projects):
-                    selected_project_name = matching_projects[selection - 1]
-                    return os.path.join(base_directory, "Active Projects", selected_project_name)
+                if multiple:
+                    answer = timed_input(f"Enter the numbers of the projects you want to {action}, separated by commas (or 'all'): ").strip().lower()
+                    selections = range(1, len(matching_projects) + 1) if answer == 'all' else [int(part) for part in answer.split(',') if part.strip()]
+                else:
+                    selections = [int(timed_input(f"Enter the number of the project you want to {action}: "))]
+
+                if selections and all(1 <= selection <= len(matching_projects) for selection in selections):
+                    selected_paths = [os.path.join(base_directory, "Active Projects", matching_projects[selection - 1]) for selection in dict.fromkeys(selections)]
+                    return selected_paths if multiple else selected_paths[0]
                 else:
                     print("Invalid selection. Please enter a valid number.")
             except ValueError:
@@ -151,6 +689,7 @@ def search_and_select_project(base_directory):
 
     except Exception as e:
         print(f"An error occurred during project selection: {str(e)}")
+        return [] if multiple else None
 
 
 def format_project_name(project_name):
@@ -160,293 +699,1448 @@ def format_project_name(project_name):
     return ''.join(capitalized_words)
 
 
-def create_projects(workbook, num_projects):
+PROJECT_TYPE_MAP = {
+    "1": "On-Prem",
+    "2": "Off-Prem"
+}
+
+
+def build_formatted_project_name(agency_name, division_name, original_project_name):
+    """Return the 'Agency-Division.ProjectName' folder name used for a project."""
+    project_name = format_project_name(original_project_name)
+
+    # Combine the names as per the given format
+    if division_name and division_name.strip() != "":
+        # If there is a division name, format the project name with it
+        return f"{agency_name}-{division_name}.{project_name.replace(' ', '')}"
+    # If there is no division name, use the old format
+    return f"{agency_name}.{project_name.replace(' ', '')}"
+
+
+def prompt_project_data(headers, is_lsar=True):
+    """Ask for one value per Yes-sheet column and return the row."""
+    data = []
+
+    for i, header in enumerate(headers):
+        # Projects entering at the design phase have no LSAR date and a fixed eReview value
+        if not is_lsar and i == 0:  # LSAR Date
+            data.append('')  # Blank value
+            continue
+        elif not is_lsar and i == 1:  # eReview
+            data.append('NA - Design')
+            continue
+
+        while True:  # This loop will continue until a valid input is received
+            # Change the prompt if the header is "On-Prem or Off-Prem"
+            prompt_message = f"On-Prem (Enter '1') or Off-Prem (Enter '2')" if header == "On-Prem or Off-Prem" else header
+            value = timed_input(f"{prompt_message}: ").strip()
+
+            if header == "On-Prem or Off-Prem":
+                # Check if the entered value is in our map (i.e., "1" or "2")
+                if value in PROJECT_TYPE_MAP:
+                    # Convert the value to "On-Prem" or "Off-Prem"
+                    value = PROJECT_TYPE_MAP[value]
+                    break
+                else:
+                    print("Invalid choice. Enter '1' for On-Prem or '2' for Off-Prem.")
+            else:
+                break
+
+        data.append(value)
+
+    return data
+
+
+def load_project_manifest(manifest_path, headers):
+    """Read projects from a CSV or JSONL file whose columns are the Yes-sheet headers.
+
+    Returns a list of (data, is_lsar) tuples. Every row is validated before anything is returned,
+    so a bad manifest never leaves half a batch of folders behind.
+    """
+    if manifest_path.lower().endswith('.jsonl'):
+        with open(manifest_path, 'r', encoding='utf-8-sig') as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    else:
+        with open(manifest_path, 'r', encoding='utf-8-sig', newline='') as file:
+            records = list(csv.DictReader(file))
+
+    projects = []
+    errors = []
+    for line_number, record in enumerate(records, start=1):
+        # Match columns to headers ignoring case and surrounding spaces
+        values = {str(key).strip().lower(): '' if value is None else str(value).strip() for key, value in record.items()}
+        data = [values.get(str(header).strip().lower(), '') for header in headers]
+
+        is_lsar = data[0] != ''
+        if is_lsar:
+            try:
+                datetime.strptime(data[0], "%m/%d/%Y")
+            except ValueError:
+                errors.append(f"Row {line_number}: LSAR date '{data[0]}' is not in MM/DD/YYYY format.")
+        elif data[1] == '':
+            data[1] = 'NA - Design'
+
+        project_type = PROJECT_TYPE_MAP.get(data[5], data[5])
+        if project_type.lower() not in ("on-prem", "off-prem"):
+            errors.append(f"Row {line_number}: '{headers[5]}' must be On-Prem or Off-Prem (or 1/2), got '{data[5]}'.")
+        data[5] = project_type
+
+        if not data[2] or not data[4]:
+            errors.append(f"Row {line_number}: '{headers[2]}' and '{headers[4]}' are required.")
+
+        projects.append((data, is_lsar))
+
+    if errors:
+        raise ValueError("Manifest has errors:\n" + "\n".join(errors))
+    return projects
+
+
+def prepare_project_files(data, is_lsar=True):
+    """Pipeline stage 'files': create the folder, status sheet and Visio diagram for one project.
+
+    Touches only the file system, so it runs on the worker threads of create_project_batch.
+    Returns the details the later stages need, or None if the project was skipped.
+    """
     base_directory = BASE_DIRECTORY
 
-    # Select the active sheet (you may need to specify the sheet name if it's not the active one)
-    sheet = workbook['Yes']
-
-    try:
-        for i in range(num_projects):
-            # Read column headers from the first row of the spreadsheet
-            headers = [cell.value for cell in sheet[1]]
-            data = []
-            project_type_map = {
-                "1": "On-Prem",
-                "2": "Off-Prem"
-            }
-
-            for i, header in enumerate(headers):
-                while True:  # This loop will continue until a valid input is received
-                    # Change the prompt if the header is "On-Prem or Off-Prem"
-                    prompt_message = f"On-Prem (Enter '1') or Off-Prem (Enter '2')" if header == "On-Prem or Off-Prem" else header
-                    value = input(f"{prompt_message}: ").strip()
-
-                    if header == "On-Prem or Off-Prem":
-                        # Check if the entered value is in our map (i.e., "1" or "2")
-                        if value in project_type_map:
-                            # Convert the value to "On-Prem" or "Off-Prem"
-                            value = project_type_map[value]
-                            break
-                        else:
-                            print("Invalid choice. Enter '1' for On-Prem or '2' for Off-Prem.")
-                        continue
-                    else:
-                        break
+    agency_name = data[2]
+    original_project_name = data[4]
+    project_name = format_project_name(original_project_name)
+    project_type = data[5].strip().lower()
+    formatted_project_name = build_formatted_project_name(agency_name, data[3], original_project_name)
+
+    # Define Visio template paths based on the extracted project_type
+    if project_type == "on-prem":
+        visio_template_path = ON_PREM_VISIO_TEMPLATE
+        new_visio_title = f"OnPrem-{formatted_project_name}-DESIGN"
+    elif project_type == "off-prem":
+        visio_template_path = OFF_PREM_VISIO_TEMPLATE
+        new_visio_title = f"OffPrem-{formatted_project_name}-DESIGN"
+    else:
+        print(f"Invalid project type '{data[5]}'. Skipping '{formatted_project_name}'.")
+        return None
+
+    docx_title = f"{formatted_project_name}.STATUS_SHEET"
+
+    # Create a folder with the specified name
+    folder_path = os.path.join(base_directory, "Active Projects", formatted_project_name)
+    lsar_date = None
+    attachment_dir = None
+    if is_lsar:
+        # Get the LSAR date from the data entered by the user (it's the first column)
+        lsar_date = datetime.strptime(data[0], "%m/%d/%Y")
+        docx_file_path = create_folder_and_docx(folder_path, docx_title, lsar_date, is_lsar=True)
+
+        # Create a folder for attachments within the project folder
+        attachment_dir = os.path.join(folder_path, "LSAR Meeting Documents")
+        os.makedirs(attachment_dir, exist_ok=True)  # Ensure the directory exists
+    else:
+        docx_file_path = create_folder_and_docx(folder_path, docx_title, is_lsar=False)
+
+    if not docx_file_path:
+        return None
+    session.folders_changed = True
+
+    # Copy the selected Visio template to the project folder under the new title; it gets edited, so no hard link
+    new_copied_visio_path = os.path.join(folder_path, f'{new_visio_title}.vsdx')
+    if os.path.exists(visio_template_path):
+        place_file(visio_template_path, new_copied_visio_path, editable=True)
+    else:
+        print(f"Error: Visio template not found at '{visio_template_path}'")
+
+    return {
+        'agency_name': agency_name,
+        'original_project_name': original_project_name,
+        'project_name': project_name,
+        'formatted_project_name': formatted_project_name,
+        'folder_path': folder_path,
+        'docx_file_path': docx_file_path,
+        'visio_path': new_copied_visio_path,
+        'lsar_date': lsar_date,
+        'attachment_dir': attachment_dir,
+    }
+
+
+def create_project_email(project):
+    """Pipeline stage 'email': render the welcome email from the Outlook template and save it as a .msg."""
+    # Create a new mail item from the template
+    mail_item = com_call(get_outlook(), 'CreateItemFromTemplate', EMAIL_TEMPLATE)
+
+    # Append the original project name to the email subject with spaces and replace the period with " - "
+    project_parts = project['formatted_project_name'].split(".")
+    if len(project_parts) == 2:
+        left_part, _ = project_parts  # Use the formatted agency and division but use the original project name for the right part
+        com_set(mail_item, 'Subject', render_email_subject('lsar', mail_item.Subject, left_part, project['original_project_name']))
+    else:
+        print("Invalid project name format. It should contain exactly one period.")
+
+    # Set the email body with HTML formatting
+    com_set(mail_item, 'HTMLBody', get_email_body_from_template(project['agency_name'], project['project_name'], project['original_project_name']))
+
+    # Attach the Visio file to the email
+    com_call(mail_item, 'Attachments.Add', project['visio_path'])
+
+    # Save the email as a .msg file in the project folder
+    # Using 3 as the integer value for olMSG to save the email as .msg format
+    email_msg_file_path = os.path.join(project['folder_path'], f"{project['project_name']}_email.msg")
+    com_call(mail_item, 'SaveAs', email_msg_file_path, 3)
+    return email_msg_file_path
+
+
+# New and closed project rows are highlighted yellow in Arial 11, with the date columns right-aligned
+PROJECT_ROW_STYLE = 'Project Highlight'
+PROJECT_ROW_DATE_STYLE = 'Project Highlight Date'
+RIGHT_ALIGNED_COLUMNS = (1, 7)  # LSAR Date and Last Update
+
+
+def register_project_row_styles(workbook):
+    """Add the project row named styles to the workbook unless it already has them."""
+    from openpyxl.styles import NamedStyle, PatternFill, Font, Alignment
+
+    for name, horizontal in ((PROJECT_ROW_STYLE, 'left'), (PROJECT_ROW_DATE_STYLE, 'right')):
+        if name not in workbook.named_styles:
+            workbook.add_named_style(NamedStyle(
+                name=name,
+                font=Font(name='Arial', size=11),
+                fill=PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid'),
+                alignment=Alignment(horizontal=horizontal)))
+
+
+def write_project_rows(sheet, rows):
+    """Add rows below the sheet's last row, highlighted like a new project, in one pass.
+
+    Every cell up to the sheet's last column gets the style. The last row is looked up once, since
+    openpyxl's max_row scans every cell and asking for it per row made long batches quadratic.
+    """
+    register_project_row_styles(sheet.parent)
+    width = sheet.max_column
+    row_number = sheet.max_row
+
+    for values in rows:
+        row_number += 1
+        for column in range(1, max(width, len(values)) + 1):
+            cell = sheet.cell(row=row_number, column=column, value=values[column - 1] if column <= len(values) else None)
+            # A named style brings General with it; keep the date format openpyxl gave a date value
+            number_format = cell.number_format
+            cell.style = PROJECT_ROW_DATE_STYLE if column in RIGHT_ALIGNED_COLUMNS else PROJECT_ROW_STYLE
+            if number_format != cell.number_format:
+                cell.number_format = number_format
+
+
+def _timed_stage(stage_times, stage, function, *args):
+    start = time.perf_counter()
+    try:
+        with trace_span(stage, 'pipeline'):
+            return function(*args)
+    finally:
+        stage_times.setdefault(stage, []).append(time.perf_counter() - start)
+
+
+def report_stage_latency(stage_times, elapsed):
+    """Print count, mean, max and total seconds for each pipeline stage."""
+    print(f"\n{'Stage':<12}{'Count':>7}{'Mean (s)':>11}{'Max (s)':>10}{'Total (s)':>11}")
+    for stage, durations in stage_times.items():
+        print(f"{stage:<12}{len(durations):>7}{sum(durations) / len(durations):>11.3f}{max(durations):>10.3f}{sum(durations):>11.3f}")
+    print(f"Batch finished in {elapsed:.2f}s")
+
+
+def journal_project_row(data):
+    """Pipeline stage 'workbook': journal the project's new Yes row; compaction writes it to the xlsx."""
+    record_workbook_changes([{'op': 'append', 'sheet': 'Yes', 'row': list(data)}])
+
+
+@traced
+def create_project_batch(projects):
+    """Create a batch of (data, is_lsar) projects, overlapping the file-system work of later projects
+    with the Outlook and workbook work of earlier ones. Returns the number of projects created.
+
+    Outlook COM objects belong to the thread that created them, so the attachment and email stages run
+    on this thread, as does every journal write; only the 'files' stage goes to the thread pool
+    (the attachment stage hands its share copies to a pool of its own).
+    """
+    stage_times = {}
+    start = time.perf_counter()
+    created = 0
+
+    with ThreadPoolExecutor(max_workers=PIPELINE_WORKERS) as pool:
+        futures = [pool.submit(_timed_stage, stage_times, 'files', prepare_project_files, data, is_lsar) for data, is_lsar in projects]
+
+        # Finish the projects in order so the rows land in the sheet in the order they were given
+        for (data, is_lsar), future in zip(projects, futures):
+            try:
+                project = future.result()
+                if project is None:
+                    continue
+
+                print(f"Project folder created at '{project['folder_path']}'")
+                print(f"Docx file created at '{project['docx_file_path']}'")
+                print(f"Visio template renamed to '{os.path.basename(project['visio_path'])}'")
+
+                if is_lsar:
+                    # Download the attachments from the calendar
+                    appointments = get_lsar_appointments(get_shared_calendar(), project['lsar_date'])
+                    _timed_stage(stage_times, 'attachments', download_attachments_from_calendar, appointments, project['attachment_dir'], project['lsar_date'])
+
+                email_msg_file_path = _timed_stage(stage_times, 'email', create_project_email, project)
+                _timed_stage(stage_times, 'workbook', journal_project_row, data)
+                created += 1
+
+                print("Email template created, Visio attached, data entered, and row highlighted successfully.")
+                print(f".msg file copied to project folder: '{email_msg_file_path}'")
+            except Exception as e:
+                print(f"An error occurred creating '{data[4]}': {str(e)}")
 
-                data.append(value)
+    report_stage_latency(stage_times, time.perf_counter() - start)
+    report_blob_savings()
+    return created
 
-            # Get the LSAR date from the data entered by the user (assuming it's the first column)
-            lsar_date = data[0]  # LSAR date is in the first column
-            lsar_date = datetime.strptime(lsar_date, "%m/%d/%Y")
 
-            # Combine agency name and project name with a period
-            agency_name = data[2]
-            division_name = data[3]
-            original_project_name = data[4]
-            project_name = format_project_name(original_project_name)
-            project_type = data[5].strip().lower()
+def create_projects(num_projects):
+    # Start each batch from a fresh view of the calendar
+    calendar_cache.clear()
 
-            # Combine the names as per the given format
-            if division_name and division_name.strip() != "":
-                # If there is a division name, format the project name with it
-                formatted_project_name = f"{agency_name}-{division_name}.{project_name.replace(' ', '')}"
+    # Read column headers from the first row of the spreadsheet
+    headers = workbook_headers('Yes')
+
+    # Collect every project first so the batch can be built in one pipelined pass
+    projects = []
+    for i in range(num_projects):
+        print(f"\nProject {i + 1} of {num_projects}")
+        projects.append((prompt_project_data(headers, is_lsar=True), True))
+
+    create_project_batch(projects)
+
+
+def create_projects_no_lsar(num_projects):
+    headers = workbook_headers('Yes')
+
+    projects = []
+    for i in range(num_projects):
+        print(f"\nProject {i + 1} of {num_projects}")
+        projects.append((prompt_project_data(headers, is_lsar=False), False))
+
+    create_project_batch(projects)
+
+
+def create_projects_from_manifest(manifest_path):
+    """Create every project listed in a CSV/JSONL manifest without prompting."""
+    calendar_cache.clear()
+    headers = workbook_headers('Yes')
+
+    try:
+        projects = load_project_manifest(manifest_path, headers)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest '{manifest_path}': {e}")
+        return 0
+
+    # One calendar query covers the LSAR dates of the whole manifest
+    lsar_dates = [datetime.strptime(data[0], "%m/%d/%Y") for data, is_lsar in projects if is_lsar]
+    if lsar_dates:
+        prefetch_lsar_appointments(get_shared_calendar(), lsar_dates)
+
+    created = create_project_batch(projects)
+
+    print(f"{created} of {len(projects)} projects from '{manifest_path}' created.")
+    return created
+
+
+def open_search_index(root_directory, reindex=False):
+    """Open the on-disk folder/file index for root_directory, refreshing it if it is stale."""
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    conn = sqlite3.connect(SEARCH_INDEX_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, path_lower TEXT, parent TEXT, mtime REAL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS files (folder TEXT, name_lower TEXT)")
+    conn.execute("CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent)")
+    conn.execute("CREATE INDEX IF NOT EXISTS files_folder ON files (folder)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    meta = dict(conn.execute("SELECT key, value FROM meta"))
+
+    # An index built for a different base directory is useless, start over
+    if reindex or meta.get('root') != root_directory:
+        refresh_search_index(conn, root_directory, full=True)
+    elif (session.folders_changed or time.time() - float(meta.get('refreshed', 0)) > INDEX_REFRESH_INTERVAL
+          or search_index_roots_changed(conn, root_directory)):
+        refresh_search_index(conn, root_directory)
+        session.folders_changed = False
+
+    return conn
+
+
+def search_index_roots_changed(conn, root_directory):
+    """True if the base directory, a project root (Active/Closed Projects, Validated Designs) or a folder directly
+    under a project root has changed since it was indexed, e.g. a colleague created, moved or added files to a project.
+    One stat per indexed folder at that level, so it is checked on every search;
+    changes deeper down wait for INDEX_REFRESH_INTERVAL."""
+    depth = scan_depth()
+    known = {root_directory: None}
+    if depth != 0:
+        project_roots = [os.path.join(root_directory, name) for name in PROJECT_ROOTS]
+        known.update(dict.fromkeys(project_roots))
+        if depth is None or depth >= 2:
+            placeholders = ', '.join('?' * len(project_roots))
+            known.update(conn.execute(f"SELECT path, mtime FROM folders WHERE parent IN ({placeholders})", project_roots))
+    known.update(conn.execute(f"SELECT path, mtime FROM folders WHERE path IN ({', '.join('?' * len(known))})", list(known)))
+
+    for folder, indexed_mtime in known.items():
+        try:
+            mtime = os.stat(folder).st_mtime
+        except OSError:
+            mtime = None
+        if indexed_mtime != mtime:
+            return True
+    return False
+
+
+def list_folder(folder):
+    """os.scandir one folder: returns ((subfolder names, file names), subfolder paths)."""
+    subfolder_names, filenames, subfolders = [], [], []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subfolder_names.append(entry.name)
+                subfolders.append(entry.path)
             else:
-                # If there is no division name, use the old format
-                formatted_project_name = f"{agency_name}.{project_name.replace(' ', '')}"
+                filenames.append(entry.name)
+    return (subfolder_names, filenames), subfolders
 
-            docx_title = f"{formatted_project_name}.STATUS_SHEET"
 
-            # Create a folder with the specified name
-            folder_path = os.path.join(base_directory, "Active Projects", formatted_project_name)
-            docx_file_path = create_folder_and_docx(folder_path, docx_title, lsar_date, is_lsar=True)
+def scan_depth():
+    return None if SCAN_MAX_DEPTH < 0 else SCAN_MAX_DEPTH
 
-            # Create a folder for attachments within the project folder
-            attachment_dir = os.path.join(folder_path, "LSAR Meeting Documents")
-            os.makedirs(attachment_dir, exist_ok=True)  # Ensure the directory exists
 
-            # Download the attachments from the calendar
-            download_attachments_from_calendar(shared_calendar, attachment_dir, lsar_date)
+def scan_tree(root, max_depth=None, prune=None, visit=list_folder, stats=None):
+    """Yield (folder, depth, listing) for root (depth 0) and the folders below it, listing up to SCAN_WORKERS
+    folders at once so the round trips to a network share overlap. Folders come out as they finish, not in tree order.
 
-            if docx_file_path:
+    visit(folder) runs on the pool and returns (listing, subfolder paths to descend into); the default, list_folder,
+    lists with os.scandir. Nothing deeper than max_depth is visited, nor any subfolder whose name matches a prune
+    pattern (SCAN_PRUNE_PATTERNS by default). A folder that can't be visited is reported and skipped.
+    stats, if given, gets 'folders', 'first_result' and 'seconds'.
+    """
+    patterns = [pattern.lower() for pattern in (SCAN_PRUNE_PATTERNS if prune is None else prune)]
+    start = time.perf_counter()
+    folders = 0
+    pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+    try:
+        pending = {pool.submit(visit, root): (root, 0)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder, depth = pending.pop(future)
                 try:
-                    # Define Visio template paths based on the extracted project_type
-                    if project_type == "on-prem":
-                        visio_template_path = ON_PREM_VISIO_TEMPLATE
-                        new_visio_title = f"OnPrem-{formatted_project_name}-DESIGN"
-                    elif project_type == "off-prem":
-                        visio_template_path = OFF_PREM_VISIO_TEMPLATE
-                        new_visio_title = f"OffPrem-{formatted_project_name}-DESIGN"
-
-                    # Copy the selected Visio template to the project folder
-                    if os.path.exists(visio_template_path):
-                        shutil.copy(visio_template_path, folder_path)
-                    else:
-                        print(f"Error: Visio template not found at '{visio_template_path}'")
+                    listing, subfolders = future.result()
+                except OSError as e:
+                    print(f"Could not scan {folder}: {e}")
+                    continue
 
-                    # Rename the copied Visio template to the new title
-                    copied_visio_path = os.path.join(folder_path, "OnPrem-SA-Example-Diagram.vsdx") if project_type == "on-prem" else os.path.join(folder_path, "OffPrem-SA-Example-Diagram.vsdx")
-                    new_copied_visio_path = os.path.join(folder_path, f'{new_visio_title}.vsdx')
-                    os.rename(copied_visio_path, new_copied_visio_path)
+                if max_depth is None or depth < max_depth:
+                    for subfolder in subfolders:
+                        name = os.path.basename(subfolder).lower()
+                        if not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                            pending[pool.submit(visit, subfolder)] = (subfolder, depth + 1)
+
+                folders += 1
+                if stats is not None and 'first_result' not in stats:
+                    stats['first_result'] = time.perf_counter() - start
+                yield folder, depth, listing
+    finally:
+        # Stopped early: drop the folders not started yet
+        pool.shutdown(cancel_futures=True)
+        if stats is not None:
+            stats['folders'] = folders
+            stats['seconds'] = time.perf_counter() - start
+
+
+@traced
+def refresh_search_index(conn, root_directory, full=False):
+    """Bring the index up to date, only re-listing folders whose mtime changed since the last refresh."""
+    start = time.perf_counter()
+    if full:
+        conn.execute("DELETE FROM folders")
+        conn.execute("DELETE FROM files")
+
+    known_mtimes = dict(conn.execute("SELECT path, mtime FROM folders"))
+    known_children = {}
+    for path, parent in conn.execute("SELECT path, parent FROM folders"):
+        known_children.setdefault(parent, []).append(path)
+    parents = {root_directory: None}
+
+    def visit(folder):
+        # On a scan_tree thread, so file system only; the connection stays on this thread
+        mtime = os.stat(folder).st_mtime
+
+        # A folder's mtime only changes when entries are added, removed or renamed in it,
+        # so an unchanged folder keeps its indexed files and we just descend into its known subfolders
+        if known_mtimes.get(folder) == mtime:
+            filenames, subfolders = None, known_children.get(folder, [])
+        else:
+            (_, filenames), subfolders = list_folder(folder)
+        parents.update(dict.fromkeys(subfolders, folder))
+        return (mtime, filenames), subfolders
 
-                    print(f"Project folder created at '{folder_path}'")
-                    print(f"Docx file created at '{docx_file_path}'")
-                    print(f"Visio template renamed to '{new_visio_title}.vsdx'")
+    seen = set()
+    rescanned = 0
+    stats = {}
+    for folder, _, (mtime, filenames) in scan_tree(root_directory, max_depth=scan_depth(), visit=visit, stats=stats):
+        seen.add(folder)
+        if filenames is None:
+            continue
 
-                    # Get the email template
-                    oft_file_path = EMAIL_TEMPLATE
+        conn.execute("DELETE FROM files WHERE folder = ?", (folder,))
+        conn.executemany("INSERT INTO files (folder, name_lower) VALUES (?, ?)", [(folder, name.lower()) for name in filenames])
+        conn.execute("INSERT OR REPLACE INTO folders (path, path_lower, parent, mtime) VALUES (?, ?, ?, ?)", (folder, folder.lower(), parents[folder], mtime))
+        rescanned += 1
 
-                    # Create a new mail item from the template
-                    mail_item = outlook.CreateItemFromTemplate(oft_file_path)
+    # Anything we did not reach this time has been removed or moved
+    removed = [(path,) for path in known_mtimes if path not in seen]
+    conn.executemany("DELETE FROM folders WHERE path = ?", removed)
+    conn.executemany("DELETE FROM files WHERE folder = ?", removed)
 
-                    # Append the original project name to the email subject with spaces and replace the period with " - "
-                    project_parts = formatted_project_name.split(".")
-                    if len(project_parts) == 2:
-                        left_part, _ = project_parts  # Use the formatted agency and division but use the original project name for the right part
-                        subject_with_spaces = f"{left_part} - {original_project_name}"
-                        mail_item.Subject = f"{mail_item.Subject} - {subject_with_spaces}"
-                    else:
-                        print("Invalid project name format. It should contain exactly one period.")
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('root', ?)", (root_directory,))
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed', ?)", (str(time.time()),))
+    conn.commit()
 
-                    # Construct the HTML email body with placeholders
-                    email_body = get_email_body_from_template(agency_name, project_name, original_project_name)
+    print(f"Search index refreshed: {len(seen)} folders, {rescanned} re-listed, {len(removed)} removed in {time.perf_counter() - start:.2f}s"
+          f" (first folder after {stats.get('first_result', 0) * 1000:.0f} ms)")
 
-                    # Set the email body with HTML formatting
-                    mail_item.HTMLBody = email_body
 
-                    # Attach the Visio file to the email
-                    visio_file_path = os.path.join(folder_path, f'{new_visio_title}.vsdx')
-                    mail_item.Attachments.Add(visio_file_path)
+def rebuild_search_index():
+    """Rebuild the search index for BASE_DIRECTORY from scratch (the --reindex option)."""
+    conn = open_search_index(BASE_DIRECTORY, reindex=True)
+    conn.close()
 
-                    # Save the email as a .msg file in the project folder
-                    email_msg_file_path = os.path.join(folder_path, f'{project_name}_email.msg')
 
-                    # Using 3 as the integer value for olMSG to save the email as .msg format
-                    mail_item.SaveAs(email_msg_file_path, 3)
+@traced
+def search_directory(keyword, directory_path):
+    print(f"Checking directory {directory_path}...")  # Diagnostic
 
-                    # Enter data into the appropriate columns
-                    sheet.append([*data])
+    directory_lower = directory_path.lower()
+    base_lower = BASE_DIRECTORY.lower()
+    if directory_lower == base_lower or directory_lower.startswith(base_lower.rstrip(os.sep) + os.sep):
+        try:
+            conn = open_search_index(BASE_DIRECTORY)
+            try:
+                # Same rule as the os.walk version: the folder path contains the keyword,
+                # or one of the files directly inside the folder does
+                keyword_lower = keyword.lower()
+                prefix = directory_lower.rstrip(os.sep) + os.sep
+                matched_folders = [path for (path,) in conn.execute(
+                    "SELECT path FROM folders "
+                    "WHERE (path_lower = ? OR substr(path_lower, 1, ?) = ?) "
+                    "AND (instr(path_lower, ?) > 0 OR EXISTS (SELECT 1 FROM files WHERE files.folder = folders.path AND instr(files.name_lower, ?) > 0)) "
+                    "ORDER BY path_lower",
+                    (directory_lower, len(prefix), prefix, keyword_lower, keyword_lower))]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Search index unavailable ({e}), walking {directory_path} instead.")
+            matched_folders = walk_directory_for_keyword(keyword, directory_path)
+    else:
+        matched_folders = walk_directory_for_keyword(keyword, directory_path)
 
-                    # Highlight the entire row as yellow
-                    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-                    for cell in sheet[sheet.max_row]:
-                        cell.font = Font(name='Arial', size=11)
-                        cell.alignment = Alignment(horizontal='right') if cell.column in [1, 7] else Alignment(horizontal='left')
-                        cell.fill = yellow_fill
+    if not matched_folders:
+        print(f"No matches found in directory {directory_path} for keyword '{keyword}'")  # Diagnostic            
+    return matched_folders
 
-                    # Save the updated Excel file
-                    workbook.save(WORKBOOK_PATH)
 
-                    print("Email template created, Visio attached, data entered, and row highlighted successfully.")
-                    print(f".msg file copied to project folder: '{email_msg_file_path}'")
+@traced
+def walk_directory_for_keyword(keyword, directory_path):
+    """Search directory_path with scan_tree; used when the index cannot serve the query."""
+    keyword_lower = keyword.lower()
+    matched_folders = []
+    stats = {}
+    start = time.perf_counter()
+    first_match = None
 
-                except Exception as e:
-                    print(f"An error occurred: {str(e)}")
+    for foldername, _, (_, filenames) in scan_tree(directory_path, max_depth=scan_depth(), stats=stats):
+        # A folder matches if its path contains the keyword, or one of the files directly inside it does
+        if keyword_lower in foldername.lower() or any(keyword_lower in filename.lower() for filename in filenames):
+            matched_folders.append(foldername)
+            if first_match is None:
+                first_match = time.perf_counter() - start
+
+    first_note = f", first match after {first_match * 1000:.0f} ms" if first_match is not None else ""
+    print(f"Walked {stats['folders']} folders in {stats['seconds']:.2f}s{first_note}")
+    # Folders finish in whatever order the share answers; list them like the index does
+    return sorted(matched_folders, key=str.lower)
+
+
+@traced
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_cell_value(value):
+    # JSON has no date types, so tag them and turn them back into datetimes on load
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    return str(value)
+
+
+def _decode_cell_value(obj):
+    if '$datetime' in obj:
+        return datetime.fromisoformat(obj['$datetime'])
+    if '$date' in obj:
+        return date.fromisoformat(obj['$date'])
+    return obj
+
+
+def process_memory_bytes():
+    """Resident memory of this process in bytes, or None where it can't be read cheaply."""
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm', 'rb') as file:
+                return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in ('PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                                                     'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak rather than current, in KB on BSD
+    except (ImportError, OSError):
+        return None
 
-    except Exception as e:
-        print(f"An error occurred during initialization: {str(e)}")
 
+def stream_sheet(spreadsheet_path, sheet_title, keyword=None, memory_limit_mb=SHEET_MEMORY_LIMIT_MB):
+    """Stream one sheet in read-only mode and return (rows, peak bytes).
 
-def create_projects_no_lsar(workbook, num_projects):
-    base_directory = BASE_DIRECTORY
-    sheet = workbook['Yes']
+    With a keyword, only the 1-based numbers of matching rows are kept instead of the rows themselves.
+    The limit and the peak are the growth of the process's resident memory while the sheet is read,
+    sampled every 1000 rows (tracemalloc would slow the read down several times over).
+    Runs in a worker process, so it must stay a module-level function.
+    """
+    import openpyxl
+
+    limit_bytes = memory_limit_mb * 1024 * 1024
+    baseline = process_memory_bytes() if limit_bytes else None
+    peak = 0
 
+    workbook = openpyxl.load_workbook(spreadsheet_path, read_only=True)
     try:
-        for i in range(num_projects):
-            headers = [cell.value for cell in sheet[1]]
-            data = []
-            project_type_map = {
-                "1": "On-Prem",
-                "2": "Off-Prem"
-            }
+        keyword_lower = keyword.lower() if keyword is not None else None
+        result = []
+        for row_idx, row in enumerate(workbook[sheet_title].iter_rows(values_only=True), start=1):
+            if keyword_lower is None:
+                result.append(row)
+            elif any(value and keyword_lower in str(value).lower() for value in row):
+                result.append(row_idx)
+
+            if baseline is not None and row_idx % 1000 == 0:
+                peak = max(peak, process_memory_bytes() - baseline)
+                if peak > limit_bytes:
+                    raise MemoryError(f"Sheet '{sheet_title}' exceeded {memory_limit_mb} MB after {row_idx} rows")
+
+        if baseline is not None:
+            peak = max(peak, process_memory_bytes() - baseline)
+        return result, peak
+    finally:
+        workbook.close()
+
+
+@traced
+def stream_workbook(spreadsheet_path, keyword=None):
+    """Run stream_sheet over every sheet, one worker process per sheet. Returns [(title, rows, peak bytes)] in sheet order."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(spreadsheet_path, read_only=True)
+    sheet_titles = workbook.sheetnames
+    workbook.close()
+
+    workers = min(SHEET_WORKERS, len(sheet_titles))
+    if workers <= 1:
+        results = [stream_sheet(spreadsheet_path, title, keyword) for title in sheet_titles]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(stream_sheet, spreadsheet_path, title, keyword) for title in sheet_titles]
+            results = [future.result() for future in futures]
+
+    return [(title, rows, peak) for title, (rows, peak) in zip(sheet_titles, results)]
+
+
+@traced
+def build_workbook_snapshot(spreadsheet_path):
+    """Parse every sheet of the workbook into plain row tuples plus a header -> column map."""
+    sheets = []
+    for title, rows, _ in stream_workbook(spreadsheet_path):
+        headers = {header: idx for idx, header in enumerate(rows[0]) if header is not None} if rows else {}
+        sheets.append({'title': title, 'headers': headers, 'rows': rows})
+    return sheets
+
+
+def temp_path_beside(path, suffix):
+    """A new, uniquely named empty file in path's folder, so an os.replace onto path stays on one volume and two
+    processes saving at once never write to the same temporary file."""
+    folder, name = os.path.split(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=folder, prefix=f"{os.path.splitext(name)[0]}.", suffix=suffix)
+    os.close(handle)
+    return temp_path
+
+
+def replace_from_temp(temp_path, path):
+    """os.replace, removing the temporary file if the replace fails."""
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def save_workbook_snapshot(spreadsheet_path, snapshot):
+    """Stamp the snapshot with the workbook's current size and mtime and write it next to the workbook."""
+    stat = os.stat(spreadsheet_path)
+    snapshot['size'] = stat.st_size
+    snapshot['mtime'] = stat.st_mtime
+    try:
+        snapshot_path = os.path.splitext(spreadsheet_path)[0] + '.snapshot.json'
+        temp_path = temp_path_beside(snapshot_path, '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            # dumps rather than dump: only dumps uses the C encoder
+            file.write(json.dumps(snapshot, default=_encode_cell_value))
+        replace_from_temp(temp_path, snapshot_path)
+    except OSError as e:
+        print(f"Could not save workbook snapshot: {e}")
+
+    # Later runs in this session can skip reading the JSON back
+    session.snapshots[spreadsheet_path] = (stat.st_size, stat.st_mtime, snapshot['sheets'])
+
+
+@traced
+def load_workbook_snapshot(spreadsheet_path=WORKBOOK_PATH):
+    """Return the cached sheets of the workbook, re-parsing the xlsx only when its size, mtime and hash say it changed."""
+    snapshot_path = os.path.splitext(spreadsheet_path)[0] + '.snapshot.json'
+    stat = os.stat(spreadsheet_path)
+
+    in_memory = session.snapshots.get(spreadsheet_path)
+    if in_memory and in_memory[:2] == (stat.st_size, stat.st_mtime):
+        return in_memory[2]
+
+    snapshot = None
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as file:
+            snapshot = json.load(file, object_hook=_decode_cell_value)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable snapshot, rebuild it below
+
+    if snapshot and snapshot.get('size') == stat.st_size and snapshot.get('mtime') == stat.st_mtime:
+        session.snapshots[spreadsheet_path] = (stat.st_size, stat.st_mtime, snapshot['sheets'])
+        return snapshot['sheets']
+
+    # Size or mtime moved; the sync client often touches files without changing them, so let the hash decide
+    digest = hash_file(spreadsheet_path)
+    if not snapshot or snapshot.get('sha256') != digest:
+        print(f"Reading workbook {spreadsheet_path}...")
+        snapshot = {'sha256': digest, 'sheets': build_workbook_snapshot(spreadsheet_path)}
 
-            for i, header in enumerate(headers):
-                # Automatically set default values for columns 0 and 1
-                if i == 0:  # LSAR Date
-                    data.append('')  # Blank value
+    save_workbook_snapshot(spreadsheet_path, snapshot)
+    return snapshot['sheets']
+
+
+# Workbook changes are written to an append-only journal first and folded into the xlsx by compaction,
+# so a create or close never waits on a full save and a crash mid-save can't lose the only copy.
+# Entries: {"op": "append", "sheet", "row"} and {"op": "move", "from", "to", "folder", "project", "row"}, each with an "id".
+# A move names its row by the project's folder name (Agency-Division.ProjectName); entries from before that have only "project".
+# _journal_lock orders the threads of this process; journal_lock() adds a lock file next to the workbook
+# for the other processes on the share. Appends, compaction and the trim that follows it hold both.
+_journal_lock = threading.RLock()
+_journal_lock_depth = [0]  # Nested journal_lock() calls on the thread holding _journal_lock
+_journal_lock_held = {}  # While the lock file is ours: its 'path' and the 'stop' event of the thread refreshing its mtime
+_journal_compactor = {}
+JOURNAL_APPLIED_PROPERTY = 'ProjectMasterJournalApplied'
+
+
+def workbook_journal_path(spreadsheet_path=None):
+    return os.path.splitext(spreadsheet_path or WORKBOOK_PATH)[0] + '.journal.jsonl'
+
+
+def workbook_journal_lock_path(spreadsheet_path=None):
+    return os.path.splitext(spreadsheet_path or WORKBOOK_PATH)[0] + '.journal.lock'
+
+
+def _acquire_journal_lock_file(lock_path):
+    """Create the lock file, waiting up to JOURNAL_LOCK_TIMEOUT while another process holds it."""
+    deadline = time.monotonic() + JOURNAL_LOCK_TIMEOUT
+    while True:
+        try:
+            handle = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > JOURNAL_LOCK_STALE:
+                    print(f"Removing a stale workbook journal lock left by a run that stopped: '{lock_path}'")
+                    os.remove(lock_path)
                     continue
-                elif i == 1:  # eReview
-                    data.append('NA - Design')
+            except FileNotFoundError:
+                continue  # Released while we looked
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Another Project_MASTER is still updating the workbook (lock file '{lock_path}').")
+            time.sleep(0.05)
+            continue
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write(f"{socket.gethostname()} {os.getpid()}\n")
+        return
+
+
+def _refresh_journal_lock_file(lock_path, stop):
+    # Keep the lock file's mtime recent so a long save is never mistaken for a crashed run's leftover
+    while not stop.wait(JOURNAL_LOCK_STALE / 4):
+        try:
+            os.utime(lock_path)
+        except OSError:
+            pass
+
+
+@contextmanager
+def journal_lock():
+    """Hold the journal against this process's other threads and, through the lock file, other processes. Reentrant."""
+    with _journal_lock:
+        if _journal_lock_depth[0] == 0:
+            lock_path = workbook_journal_lock_path()
+            _acquire_journal_lock_file(lock_path)
+            stop = threading.Event()
+            threading.Thread(target=_refresh_journal_lock_file, args=(lock_path, stop), daemon=True).start()
+            _journal_lock_held.update(path=lock_path, stop=stop)
+        _journal_lock_depth[0] += 1
+        try:
+            yield
+        finally:
+            _journal_lock_depth[0] -= 1
+            if _journal_lock_depth[0] == 0:
+                _journal_lock_held.pop('stop').set()
+                try:
+                    os.remove(_journal_lock_held.pop('path'))
+                except FileNotFoundError:
+                    pass
+
+
+def read_workbook_journal(spreadsheet_path=None):
+    """Return the pending journal entries, oldest first. A torn last line from a crash mid-write is ignored,
+    and so is any entry whose id appeared earlier, so a change journaled twice is applied once."""
+    try:
+        with open(workbook_journal_path(spreadsheet_path), 'r', encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+    entries, seen_ids = [], set()
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line, object_hook=_decode_cell_value)
+        except ValueError:
+            if line_number != len(lines):
+                raise
+            print("Ignoring an incomplete last entry in the workbook journal.")
+            continue
+        if entry['id'] not in seen_ids:
+            seen_ids.add(entry['id'])
+            entries.append(entry)
+    return entries
+
+
+def record_workbook_changes(entries):
+    """Hand entries to the write coordinator if one is running, otherwise journal them here.
+
+    Either way they are on disk when this returns; compaction applies them to the xlsx later.
+    """
+    entries = [dict(entry, id=uuid.uuid4().hex) for entry in entries]
+    if not _coordinator:
+        reply = coordinator_request({'op': 'submit', 'entries': entries})
+        if reply is not None:
+            if not reply.get('ok'):
+                raise RuntimeError(f"The write coordinator refused the changes: {reply.get('error')}")
+            return
+    append_journal_entries(entries)
+
+
+def append_journal_entries(entries):
+    """Append entries that already have ids to the journal and fsync it before returning."""
+    with journal_lock():
+        with open(workbook_journal_path(), 'a', encoding='utf-8') as file:
+            for entry in entries:
+                file.write(json.dumps(entry, default=_encode_cell_value) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        # The coordinator saves every batch after a short window; a standalone run waits for the threshold
+        wake = bool(_coordinator) or len(read_workbook_journal()) >= JOURNAL_COMPACT_ENTRIES
+
+    compactor_wake = _journal_compactor.get('wake')
+    if wake and compactor_wake:
+        compactor_wake.set()
+
+
+def project_row_cells(headers, row):
+    """The (agency, division, project) cells of a row, stripped, with '' for empty or missing ones."""
+    cells = [row[headers[name]] if name in headers and headers[name] < len(row) else None for name in ('Agency', 'Division', 'Project')]
+    return tuple(str(cell).strip() if cell else '' for cell in cells)
+
+
+def move_matches_row(entry, headers, row):
+    """True if the row is the one the move entry takes: the same folder name, or for older entries the same Project cell."""
+    if 'folder' in entry:
+        cells = project_row_cells(headers, row)
+        return bool(cells[2]) and build_formatted_project_name(*cells) == entry['folder']
+    return headers['Project'] < len(row) and row[headers['Project']] == entry['project']
+
+
+def apply_journal_to_sheets(sheets, entries):
+    """Return the snapshot sheets with the journal entries applied, leaving the cached snapshot untouched."""
+    sheets = [dict(sheet, rows=list(sheet['rows'])) for sheet in sheets]
+    by_title = {sheet['title']: sheet for sheet in sheets}
+
+    for entry in entries:
+        row = tuple(None if value == '' else value for value in entry['row'])
+        target = by_title[entry['sheet'] if entry['op'] == 'append' else entry['to']]
+        if target['rows'] and len(row) < len(target['rows'][0]):
+            row += (None,) * (len(target['rows'][0]) - len(row))  # Same width as rows read from the file
+
+        if entry['op'] == 'append':
+            target['rows'].append(row)
+        elif entry['op'] == 'move':
+            source = by_title[entry['from']]
+            for row_idx in range(1, len(source['rows'])):
+                if move_matches_row(entry, source['headers'], source['rows'][row_idx]):
+                    del source['rows'][row_idx]
+                    break
+            target['rows'].append(row)
+    return sheets
+
+
+def read_workbook_sheets(spreadsheet_path=WORKBOOK_PATH):
+    """The workbook as of the last compaction (from the snapshot) with the pending journal merged over it."""
+    with _journal_lock:
+        sheets = load_workbook_snapshot(spreadsheet_path)
+        entries = read_workbook_journal(spreadsheet_path)
+    return apply_journal_to_sheets(sheets, entries) if entries else sheets
+
+
+def workbook_headers(sheet_title='Yes'):
+    """Column headers of a sheet, read from the snapshot."""
+    for sheet in read_workbook_sheets(WORKBOOK_PATH):
+        if sheet['title'] == sheet_title:
+            return list(sheet['rows'][0]) if sheet['rows'] else []
+    raise KeyError(f"Worksheet '{sheet_title}' not found in the workbook")
+
+
+def apply_journal_to_workbook(workbook, entries):
+    """Replay journal entries onto the open workbook. Each sheet gets all its new rows in one
+    write_project_rows call and loses its moved rows in one delete_rows_in_one_pass call."""
+    new_rows = {}  # sheet title -> rows to add, in journal order
+    sheet_rows = {}  # sheet title -> (headers, [(row number, values)]), read on the first move out of the sheet
+    rows_to_delete = {}
+
+    for entry in entries:
+        if entry['op'] == 'append':
+            new_rows.setdefault(entry['sheet'], []).append(list(entry['row']))
+
+        elif entry['op'] == 'move':
+            if entry['from'] not in sheet_rows:
+                sheet_rows[entry['from']] = read_sheet_rows(workbook[entry['from']])
+            headers, rows = sheet_rows[entry['from']]
+            deleting = rows_to_delete.setdefault(entry['from'], [])
+
+            # Each move takes the first matching row that is not already being moved; the row is copied as it is in the workbook
+            found = next(((row_number, values) for row_number, values in rows if row_number not in deleting and move_matches_row(entry, headers, values)), None)
+            if found:
+                row_number, project_row = found
+                deleting.append(row_number)
+            else:
+                # A project added earlier in this batch hasn't been written yet; move it before it is
+                pending = new_rows.get(entry['from'], [])
+                project_row = next((row for row in pending if move_matches_row(entry, headers, row)), None)
+                if project_row is None:
+                    print(f"Project '{entry['project']}' not found in the '{entry['from']}' worksheet.")
                     continue
+                pending.remove(project_row)
 
-                while True:
-                    prompt_message = f"On-Prem (Enter '1') or Off-Prem (Enter '2')" if header == "On-Prem or Off-Prem" else header
-                    value = input(f"{prompt_message}: ").strip()
+            new_rows.setdefault(entry['to'], []).append(project_row)
 
-                    if header == "On-Prem or Off-Prem":
-                        if value in project_type_map:
-                            value = project_type_map[value]
-                            break
-                        else:
-                            print("Invalid choice. Enter '1' for On-Prem or '2' for Off-Prem.")
-                    else:
-                        break
+    for title, rows in new_rows.items():
+        write_project_rows(workbook[title], rows)
+    for title, row_numbers in rows_to_delete.items():
+        delete_rows_in_one_pass(workbook[title], row_numbers)
 
-                data.append(value)
 
-            current_date = datetime.now().strftime("%m/%d/%Y")
-            agency_name = data[2]
-            division_name = data[3]
-            original_project_name = data[4]
-            project_name = format_project_name(original_project_name)
-            project_type = data[5].strip().lower()
+SPREADSHEET_NAMESPACE = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIP_NAMESPACE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
 
-            if division_name and division_name.strip() != "":
-                formatted_project_name = f"{agency_name}-{division_name}.{project_name.replace(' ', '')}"
-            else:
-                formatted_project_name = f"{agency_name}.{project_name.replace(' ', '')}"
 
-            docx_title = f"{formatted_project_name}.STATUS_SHEET"
-            folder_path = os.path.join(base_directory, "Active Projects", formatted_project_name)
-            docx_file_path = create_folder_and_docx(folder_path, docx_title, is_lsar=False)
+def _custom_property_pattern(name):
+    return re.compile(r'(<property\b[^>]*\bname="' + re.escape(name) + r'"[^>]*>\s*<vt:lpwstr\b[^>]*>)(.*?)(</vt:lpwstr>)', re.S)
 
-            if project_type == "on-prem":
-                visio_template_path = ON_PREM_VISIO_TEMPLATE
-                new_visio_title = f"OnPrem-{formatted_project_name}-DESIGN"
-            elif project_type == "off-prem":
-                visio_template_path = OFF_PREM_VISIO_TEMPLATE
-                new_visio_title = f"OffPrem-{formatted_project_name}-DESIGN"
 
-            if os.path.exists(visio_template_path):
-                shutil.copy(visio_template_path, folder_path)
+def read_applied_journal_ids(spreadsheet_path):
+    """Ids of the journal entries the last compaction wrote, read from docProps/custom.xml without loading the workbook."""
+    try:
+        with zipfile.ZipFile(spreadsheet_path) as package:
+            custom_xml = package.read('docProps/custom.xml').decode('utf-8')
+    except (KeyError, OSError, zipfile.BadZipFile):
+        return set()
+    match = _custom_property_pattern(JOURNAL_APPLIED_PROPERTY).search(custom_xml)
+    try:
+        return set(json.loads(html.unescape(match.group(2)))) if match else set()
+    except ValueError:
+        return set()
+
+
+def _column_letter(column):
+    letters = ''
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _worksheet_parts(package):
+    """Map each sheet title to the zip path of its worksheet XML."""
+    workbook_xml = ElementTree.fromstring(package.read('xl/workbook.xml'))
+    relationships = ElementTree.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+    targets = {relationship.get('Id'): relationship.get('Target') for relationship in relationships}
+
+    parts = {}
+    for sheet in workbook_xml.iter(f'{{{SPREADSHEET_NAMESPACE}}}sheet'):
+        target = targets.get(sheet.get(f'{{{RELATIONSHIP_NAMESPACE}}}id'), '')
+        parts[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+    return parts
+
+
+def _highlight_style_ids(styles_xml):
+    """Return the cellXfs indexes matching write_project_rows' formatting as (left aligned, right aligned), or None.
+
+    That is Arial 11 with no colour or emphasis on a solid yellow fill, General number format and no border drawn.
+    They exist once any row has been written through openpyxl.
+    """
+    namespace = {'m': SPREADSHEET_NAMESPACE}
+    root = ElementTree.fromstring(styles_xml)
+
+    plain_arial = set()
+    for index, font in enumerate(root.findall('m:fonts/m:font', namespace)):
+        name = font.find('m:name', namespace)
+        size = font.find('m:sz', namespace)
+        decorated = any(font.find(f'm:{tag}', namespace) is not None for tag in ('b', 'i', 'u', 'strike', 'color'))
+        if name is not None and name.get('val') == 'Arial' and size is not None and float(size.get('val', 0)) == 11 and not decorated:
+            plain_arial.add(index)
+
+    yellow = set()
+    for index, fill in enumerate(root.findall('m:fills/m:fill', namespace)):
+        pattern = fill.find('m:patternFill', namespace)
+        color = pattern.find('m:fgColor', namespace) if pattern is not None else None
+        if pattern is not None and pattern.get('patternType') == 'solid' and color is not None and color.get('rgb', '').upper().endswith('FFFF00'):
+            yellow.add(index)
+
+    # Named styles bring their own border entry, with every side present but none drawn
+    no_border = {index for index, border in enumerate(root.findall('m:borders/m:border', namespace))
+                 if not any(side.get('style') for side in border)}
+
+    by_alignment = {}
+    for index, xf in enumerate(root.findall('m:cellXfs/m:xf', namespace)):
+        if (int(xf.get('fontId', 0)) in plain_arial and int(xf.get('fillId', 0)) in yellow
+                and xf.get('numFmtId', '0') == '0' and int(xf.get('borderId', 0)) in no_border):
+            alignment = xf.find('m:alignment', namespace)
+            by_alignment.setdefault(alignment.get('horizontal') if alignment is not None else None, index)
+
+    if 'left' in by_alignment and 'right' in by_alignment:
+        return by_alignment['left'], by_alignment['right']
+    return None
+
+
+def _append_rows_to_sheet_xml(sheet_xml, rows, left_style, right_style):
+    """Insert rows styled like write_project_rows at the end of sheetData, or return None if the sheet needs a full save."""
+    text = sheet_xml.decode('utf-8')
+    if '<sheetData/>' in text:
+        text = text.replace('<sheetData/>', '<sheetData></sheetData>', 1)
+    end = text.find('</sheetData>')
+    if end == -1:
+        return None
+
+    # openpyxl appends below the last cell; an empty <row> further down would leave the rows out of order
+    last_cell = re.compile(r'<c r="[A-Z]+(\d+)"').match(text, text.rfind('<c r="', 0, end))
+    last_row = int(last_cell.group(1)) if last_cell else 0
+    last_row_element = re.compile(r'<row r="(\d+)"').match(text, text.rfind('<row r="', 0, end))
+    if last_row_element and int(last_row_element.group(1)) > last_row:
+        return None
+
+    dimension = re.search(r'<dimension ref="[A-Z]+\d+(?::([A-Z]+)\d+)?"/>', text)
+    width = _column_number(dimension.group(1)) if dimension and dimension.group(1) else 0
+    width = max([width] + [len(row) for row in rows])
+
+    row_elements = []
+    for row_number, values in enumerate(rows, start=last_row + 1):
+        cells = []
+        for column in range(1, width + 1):
+            value = values[column - 1] if column <= len(values) else None
+            reference = f'{_column_letter(column)}{row_number}'
+            style = right_style if column in RIGHT_ALIGNED_COLUMNS else left_style
+            if value is None or value == '':
+                cells.append(f'<c r="{reference}" s="{style}"/>')
+            elif isinstance(value, str):
+                cells.append(f'<c r="{reference}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{html.escape(value, quote=False)}</t></is></c>')
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f'<c r="{reference}" s="{style}"><v>{value!r}</v></c>')
             else:
-                print(f"Error: Visio template not found at '{visio_template_path}'")
-
-            copied_visio_path = os.path.join(folder_path, "OnPrem-SA-Example-Diagram.vsdx") if project_type == "on-prem" else os.path.join(folder_path, "OffPrem-SA-Example-Diagram.vsdx")
-            new_copied_visio_path = os.path.join(folder_path, f'{new_visio_title}.vsdx')
-            os.rename(copied_visio_path, new_copied_visio_path)
-
-            print(f"Project folder created at '{folder_path}'")
-            print(f"Docx file created at '{docx_file_path}'")
-            print(f"Visio template renamed to '{new_visio_title}.vsdx'")
-
-            oft_file_path = EMAIL_TEMPLATE
-            mail_item = outlook.CreateItemFromTemplate(oft_file_path)
-            project_parts = formatted_project_name.split(".")
-            if len(project_parts) == 2:
-                left_part, _ = project_parts
-                subject_with_spaces = f"{left_part} - {original_project_name}"
-                mail_item.Subject = f"{mail_item.Subject} - {subject_with_spaces}"
+                return None  # Dates and the like need openpyxl's number formats
+        row_elements.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+
+    text = text[:end] + ''.join(row_elements) + text[end:]
+    new_dimension = f'<dimension ref="A1:{_column_letter(width)}{last_row + len(rows)}"/>'
+    text = text.replace(dimension.group(0), new_dimension, 1) if dimension else text
+    return text.encode('utf-8')
+
+
+def _copy_zip_entry(package, output, info):
+    """Stream one entry from package into output through zipfile's public API, keeping its name, date and compression."""
+    with package.open(info) as source, output.open(copy.copy(info), 'w') as destination:
+        shutil.copyfileobj(source, destination, 1024 * 1024)
+
+
+def _check_zip_copy(temp_path, names):
+    """Raise unless temp_path reopens as a zip holding exactly names, every entry passing its CRC check."""
+    with zipfile.ZipFile(temp_path) as written:
+        bad_entry = written.testzip()
+        if bad_entry is not None:
+            raise zipfile.BadZipFile(f"'{bad_entry}' failed its CRC check in the rewritten workbook")
+        if set(written.namelist()) != names:
+            raise zipfile.BadZipFile("The rewritten workbook doesn't hold the same parts as the original")
+
+
+@traced
+def save_appended_rows(spreadsheet_path, entries, applied_value):
+    """Write journaled 'append' entries by patching only the affected worksheet XML and docProps/custom.xml.
+
+    Every other part of the package is streamed over unchanged, and the new file must reopen and pass testzip()
+    before it replaces the original. Returns False, having written nothing,
+    when the workbook needs a full openpyxl save instead (no highlight style or journal property yet,
+    or values only openpyxl can format).
+    """
+    with zipfile.ZipFile(spreadsheet_path) as package:
+        names = set(package.namelist())
+        if 'docProps/custom.xml' not in names:
+            return False
+
+        styles = _highlight_style_ids(package.read('xl/styles.xml'))
+        if styles is None:
+            return False
+
+        parts = _worksheet_parts(package)
+        rows_by_part = {}
+        for entry in entries:
+            if parts.get(entry['sheet']) not in names:
+                return False
+            rows_by_part.setdefault(parts[entry['sheet']], []).append(entry['row'])
+
+        replaced = {}
+        for part, rows in rows_by_part.items():
+            replaced[part] = _append_rows_to_sheet_xml(package.read(part), rows, *styles)
+            if replaced[part] is None:
+                return False
+
+        custom_xml = package.read('docProps/custom.xml').decode('utf-8')
+        pattern = _custom_property_pattern(JOURNAL_APPLIED_PROPERTY)
+        if not pattern.search(custom_xml):
+            return False
+        replaced['docProps/custom.xml'] = pattern.sub(lambda match: match.group(1) + html.escape(applied_value, quote=False) + match.group(3), custom_xml, count=1).encode('utf-8')
+
+        temp_path = temp_path_beside(spreadsheet_path, '.xlsx')
+        try:
+            with zipfile.ZipFile(temp_path, 'w') as output:
+                for info in package.infolist():
+                    if info.filename in replaced:
+                        output.writestr(info, replaced[info.filename])
+                    else:
+                        _copy_zip_entry(package, output, info)
+            _check_zip_copy(temp_path, names)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    replace_from_temp(temp_path, spreadsheet_path)
+    return True
+
+
+@traced
+def compact_workbook_journal():
+    """Apply the pending journal to the workbook with one atomic save, then drop the applied entries.
+
+    The ids of the entries applied are stored in the workbook itself, so if we crash between the save and
+    trimming the journal, the next compaction skips them instead of adding the rows twice; an entry journaled
+    twice is read back once (see read_workbook_journal). Batches of
+    new rows go through save_appended_rows; anything that removes rows goes through openpyxl.
+    """
+    with journal_lock():
+        entries = read_workbook_journal()
+        if not entries:
+            return 0
+
+        already_applied = read_applied_journal_ids(WORKBOOK_PATH)
+        to_apply = [entry for entry in entries if entry['id'] not in already_applied]
+        applied_value = json.dumps([entry['id'] for entry in to_apply])
+
+        # New rows only: patch them into the sheet XML instead of re-serializing the whole workbook
+        if to_apply and all(entry['op'] == 'append' for entry in to_apply):
+            sheets = load_workbook_snapshot(WORKBOOK_PATH)
+            if save_appended_rows(WORKBOOK_PATH, to_apply, applied_value):
+                save_workbook_snapshot(WORKBOOK_PATH, {'sha256': hash_file(WORKBOOK_PATH), 'sheets': apply_journal_to_sheets(sheets, to_apply)})
+                if session.workbook is not None:
+                    # Keep the open copy in step with the file rather than reloading it
+                    apply_journal_to_workbook(session.workbook, to_apply)
+                    session.workbook_stamp = session._stamp(WORKBOOK_PATH)
+                to_apply_full = []
             else:
-                print("Invalid project name format. It should contain exactly one period.")
-
-            email_body = get_email_body_from_template(agency_name, project_name, original_project_name)
-            mail_item.HTMLBody = email_body
-            visio_file_path = os.path.join(folder_path, f'{new_visio_title}.vsdx')
-            mail_item.Attachments.Add(visio_file_path)
-            email_msg_file_path = os.path.join(folder_path, f'{project_name}_email.msg')
-            mail_item.SaveAs(email_msg_file_path, 3)
-
-            sheet.append([*data])
-            yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-            for cell in sheet[sheet.max_row]:
-                cell.font = Font(name='Arial', size=11)
-                cell.alignment = Alignment(horizontal='right') if cell.column in [1, 7] else Alignment(horizontal='left')
-                cell.fill = yellow_fill
-
-            workbook.save(WORKBOOK_PATH)
-            print("Email template created, Visio attached, data entered, and row highlighted successfully.")
-            print(f".msg file copied to project folder: '{email_msg_file_path}'")
+                to_apply_full = to_apply
+        else:
+            to_apply_full = to_apply
 
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+        if to_apply_full:
+            from openpyxl.packaging.custom import StringProperty
+            workbook = session.get_workbook()
+            try:
+                apply_journal_to_workbook(workbook, to_apply_full)
+                workbook.custom_doc_props.props = [prop for prop in workbook.custom_doc_props.props if prop.name != JOURNAL_APPLIED_PROPERTY]
+                workbook.custom_doc_props.append(StringProperty(name=JOURNAL_APPLIED_PROPERTY, value=applied_value))
+                session.save_workbook()
+            except Exception:
+                # Leave the journal as it is and start from the file next time
+                session.discard_workbook()
+                raise
+
+        # Keep anything journaled since we read it, then swap the trimmed journal in
+        applied_ids = {entry['id'] for entry in entries}
+        remaining = [entry for entry in read_workbook_journal() if entry['id'] not in applied_ids]
+        journal_path = workbook_journal_path()
+        if remaining:
+            temp_path = temp_path_beside(journal_path, '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                for entry in remaining:
+                    file.write(json.dumps(entry, default=_encode_cell_value) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            replace_from_temp(temp_path, journal_path)
+        else:
+            os.remove(journal_path)
 
+    return len(to_apply)
 
-def search_directory(keyword, directory_path):
-    matched_folders = []
 
-    print(f"Checking directory {directory_path}...")  # Diagnostic
-    for foldername, subfolders, filenames in os.walk(directory_path):
-        match_found = False  # Flag to track if a match is found in the current folder
+def flush_workbook_changes():
+    """Get every pending change into the xlsx now: through the coordinator when one is running, otherwise here."""
+    if not _coordinator:
+        reply = coordinator_request({'op': 'flush'}, timeout=None)
+        if reply is not None:
+            if not reply.get('ok'):
+                raise RuntimeError(f"The write coordinator could not save the workbook: {reply.get('error')}")
+            return reply['applied']
+    return compact_workbook_journal()
 
-        # Check folder name for a match
-        if keyword.lower() in foldername.lower():
-            matched_folders.append(foldername)
-            match_found = True
 
-        # If no match found in folder name, check filenames
-        if not match_found:
-            for filename in filenames:
-                if keyword.lower() in filename.lower():
-                    matched_folders.append(foldername)
-                    break  # Exit the loop once a match is found
+def compact_workbook_journal_on_exit():
+    # Let a compaction in progress finish and release the journal lock before the interpreter stops its thread
+    stop_journal_compactor()
+    if not _coordinator and coordinator_request({'op': 'ping'}) is not None:
+        return  # The coordinator saves our changes with everyone else's
+    try:
+        compact_workbook_journal()
+    except Exception as e:
+        print(f"Could not update the workbook: {str(e)}")
+        print(f"The changes are kept in '{workbook_journal_path()}' and will be applied on the next run.")
 
-    if not matched_folders:
-        print(f"No matches found in directory {directory_path} for keyword '{keyword}'")  # Diagnostic            
-    return matched_folders
 
+def start_journal_compactor():
+    """Compact the journal on a background thread every JOURNAL_COMPACT_INTERVAL seconds, or sooner once it grows."""
+    if 'thread' in _journal_compactor:
+        return
+    wake = threading.Event()
+
+    stop = threading.Event()
 
+    def run():
+        while not stop.is_set():
+            woken = wake.wait(JOURNAL_COMPACT_INTERVAL)
+            if stop.is_set():
+                break
+            if _coordinator:
+                if woken:
+                    time.sleep(COORDINATOR_BATCH_WINDOW)  # Let other operators' changes join this save
+            elif coordinator_request({'op': 'ping'}) is not None:
+                wake.clear()
+                continue  # Only the coordinator writes the workbook while it is running
+            wake.clear()
+            try:
+                compact_workbook_journal()
+            except Exception as e:
+                print(f"Could not update the workbook yet, will retry: {str(e)}")
+
+    _journal_compactor['wake'] = wake
+    _journal_compactor['stop'] = stop
+    _journal_compactor['thread'] = threading.Thread(target=run, daemon=True)
+    _journal_compactor['thread'].start()
+
+
+def stop_journal_compactor():
+    """Stop the background compactor, waiting for a compaction it has started to finish."""
+    thread = _journal_compactor.pop('thread', None)
+    if thread is None:
+        return
+    _journal_compactor['stop'].set()
+    _journal_compactor['wake'].set()
+    thread.join()
+    _journal_compactor.pop('wake', None)
+    _journal_compactor.pop('stop', None)
+
+
+# Write coordinator (--coordinator): when several architects share the workbook, one process is its only writer.
+# The others send their changes to it over a local socket, one JSON request and one JSON reply per line;
+# it journals them and folds them into the xlsx in batched saves. Without one, each run compacts on its own.
+_coordinator = {}  # {'server': ...} in the coordinator process itself
+
+
+def coordinator_request(message, address=None, timeout=COORDINATOR_REPLY_TIMEOUT):
+    """Send one request to the write coordinator and return its reply, or None if no coordinator is listening.
+
+    Only a failed connection means "no coordinator". Once the request is sent the coordinator may act on it,
+    so a missing answer raises RuntimeError rather than letting the caller apply the change a second time.
+    A ping is the exception: it changes nothing, so an unanswered ping is just None.
+    """
+    with trace_span(f"coordinator {message['op']}", 'coordinator'):
+        try:
+            connection = socket.create_connection(address or (COORDINATOR_HOST, COORDINATOR_PORT), timeout=COORDINATOR_TIMEOUT)
+        except OSError:
+            return None
+        try:
+            with connection:
+                connection.settimeout(COORDINATOR_TIMEOUT if message['op'] == 'ping' else timeout)
+                connection.sendall((json.dumps(message, default=_encode_cell_value) + "\n").encode('utf-8'))
+                with connection.makefile('r', encoding='utf-8') as replies:
+                    reply = replies.readline()
+        except OSError as e:
+            reply, error = None, e
+        else:
+            error = None
+    if reply:
+        return json.loads(reply, object_hook=_decode_cell_value)
+    if message['op'] == 'ping':
+        return None
+    raise RuntimeError(f"The write coordinator took the '{message['op']}' request but did not answer ({error or 'connection closed'}); "
+                       f"it may still apply it, so check the workbook before trying again.")
+
+
+def handle_coordinator_request(request):
+    """Carry out one client request in the coordinator process.
+
+    submit: journal the client's append/move entries. close: resolve folder names to moves here, so two
+    operators closing the same project folder produce one move. flush: compact now and reply once saved.
+    """
+    op = request.get('op')
+    if op == 'ping':
+        return {'ok': True, 'pid': os.getpid()}
+    if op == 'submit':
+        for entry in request['entries']:
+            if entry.get('op') not in ('append', 'move') or not entry.get('id'):
+                raise ValueError(f"Unsupported journal entry: {entry}")
+        append_journal_entries(request['entries'])
+        return {'ok': True}
+    if op == 'close':
+        return {'ok': True, 'moved': close_project_rows(request['folders'])}
+    if op == 'flush':
+        return {'ok': True, 'applied': compact_workbook_journal()}
+    raise ValueError(f"Unknown request '{op}'")
+
+
+class WriteCoordinatorHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = handle_coordinator_request(json.loads(line, object_hook=_decode_cell_value))
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self.wfile.write((json.dumps(reply, default=_encode_cell_value) + "\n").encode('utf-8'))
+
+
+def start_write_coordinator(host=None, port=None):
+    """Serve coordinator requests on background threads and return the server. Port 0 picks a free port."""
+    server = socketserver.ThreadingTCPServer((host or COORDINATOR_HOST, COORDINATOR_PORT if port is None else port), WriteCoordinatorHandler)
+    server.daemon_threads = True
+    _coordinator['server'] = server
+    start_journal_compactor()
+    # Changes journaled locally while no coordinator was running go into the first save
+    _journal_compactor['wake'].set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_write_coordinator():
+    server = _coordinator.pop('server', None)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        # Clients fall back to their own journal from here on; save what we accepted first
+        compact_workbook_journal_on_exit()
+
+
+def run_write_coordinator():
+    """--coordinator: be the only process writing the workbook until Ctrl+C."""
+    if coordinator_request({'op': 'ping'}) is not None:
+        print(f"A write coordinator is already running on {COORDINATOR_HOST}:{COORDINATOR_PORT}.")
+        return
+    try:
+        start_write_coordinator()
+    except OSError as e:
+        print(f"Could not start the write coordinator on {COORDINATOR_HOST}:{COORDINATOR_PORT}: {str(e)}")
+        return
+
+    print(f"Write coordinator for '{WORKBOOK_PATH}' listening on {COORDINATOR_HOST}:{COORDINATOR_PORT}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_write_coordinator()
+
+
+@traced
 def search_spreadsheet(keyword, spreadsheet_path):
-    workbook = openpyxl.load_workbook(spreadsheet_path)
+    if SPREADSHEET_SEARCH_MODE == 'streaming':
+        return search_spreadsheet_streaming(keyword, spreadsheet_path)
+
+    sheets = read_workbook_sheets(spreadsheet_path)
 
     matched_rows = []
+    keyword_lower = keyword.lower()
 
     print(f"Checking workbook {spreadsheet_path}...")  # Diagnostic
-    for sheet in workbook.worksheets:
-        for row_idx, row in enumerate(sheet.iter_rows(), start=1):  # Using start=1 for 1-based row numbering
-            for cell in row:
-                if cell.value and keyword.lower() in str(cell.value).lower():
-                    matched_rows.append((sheet.title, row_idx))
+    for sheet in sheets:
+        for row_idx, row in enumerate(sheet['rows'], start=1):  # Using start=1 for 1-based row numbering
+            for value in row:
+                if value and keyword_lower in str(value).lower():
+                    matched_rows.append((sheet['title'], row_idx))
                     break  # Break out of the cell loop as we found a match in this row
 
     if not matched_rows:
@@ -454,35 +2148,305 @@ def search_spreadsheet(keyword, spreadsheet_path):
     return matched_rows
 
 
-def get_directories_matching_keyword(keyword, base_directory):
-    """Return a list of directories that match the given keyword, one level below the base_directory."""
-    matching_dirs = []
+@traced
+def search_spreadsheet_streaming(keyword, spreadsheet_path):
+    """Search the xlsx directly, scanning each sheet in its own process without keeping cells in memory."""
+    # The file only has what has been compacted, so fold in the pending changes first
+    if spreadsheet_path == WORKBOOK_PATH:
+        flush_workbook_changes()
 
+    matched_rows = []
+
+    print(f"Streaming workbook {spreadsheet_path}...")  # Diagnostic
+    for title, row_numbers, peak in stream_workbook(spreadsheet_path, keyword):
+        matched_rows.extend((title, row_idx) for row_idx in row_numbers)
+        if peak:
+            print(f"  {title}: peak {peak / (1024 * 1024):.1f} MB of {SHEET_MEMORY_LIMIT_MB} MB")
+
+    if not matched_rows:
+        print(f"No matches found in workbook {spreadsheet_path} for keyword '{keyword}'")  # Diagnostic
+    return matched_rows
+
+
+def compact_name(text):
+    """A name with case, spaces and punctuation removed."""
+    return re.sub(r'[^0-9a-z]', '', str(text).lower())
+
+
+def name_trigrams(text):
+    """Trigrams of a name with case, spaces and punctuation removed, so 'Agency-Div.ProjectName' and 'Project Name' share them."""
+    compact = compact_name(text)
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class TrigramIndex:
+    """In-memory trigram index returning the names most similar to a query, best first."""
+
+    def __init__(self):
+        self.entries = []      # (text, payload)
+        self.gram_counts = []  # Distinct trigrams per entry
+        self.postings = {}     # Trigram -> ids of the entries containing it
+
+    def add(self, text, payload=None):
+        grams = name_trigrams(text)
+        entry_id = len(self.entries)
+        self.entries.append((text, payload))
+        self.gram_counts.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(entry_id)
+
+    def search(self, query, limit=10, min_score=0.5):
+        """Return up to limit (text, payload, score) tuples.
+
+        The score is the share of the query's trigrams found in the entry, so a short keyword fully contained
+        in a long folder name scores 1.0; ties go to the entry with fewer extra trigrams.
+        """
+        grams = name_trigrams(query)
+        if not grams:
+            # Too short for trigrams; fall back to a plain substring test
+            compact = compact_name(query)
+            return [(text, payload, 1.0) for text, payload in self.entries
+                    if compact in compact_name(text)][:limit]
+
+        counts = Counter()
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting:
+                counts.update(posting)  # Counter.update on a list counts in C
+
+        needed = min_score * len(grams)
+        gram_counts = self.gram_counts
+        best = heapq.nlargest(limit, ((overlap, -gram_counts[entry_id], entry_id) for entry_id, overlap in counts.items() if overlap >= needed))
+        return [(*self.entries[entry_id], overlap / len(grams)) for overlap, _, entry_id in best]
+
+
+def rank_names(keyword, names, limit=None, min_score=0.5):
+    """Order names by similarity to keyword, dropping the ones that are not similar at all."""
+    if not keyword.strip():
+        return sorted(names, key=str.lower)
+    index = TrigramIndex()
+    for name in names:
+        index.add(name)
+    return [text for text, _, _ in index.search(keyword, limit or len(names), min_score)]
+
+
+# Project names from folders and workbook rows, rebuilt when either source changes
+_project_name_index = (None, None)
+PROJECT_ROOTS = ("Active Projects", "Closed Projects", "Validated Designs")
+
+
+def workbook_stamp():
+    """Size and mtime of the workbook and of its journal; changes whenever the rows read through the journal can."""
+    workbook_stat = os.stat(WORKBOOK_PATH)
+    journal_path = workbook_journal_path()
+    journal_stat = os.stat(journal_path) if os.path.exists(journal_path) else None
+    return [workbook_stat.st_size, workbook_stat.st_mtime, journal_stat and journal_stat.st_size, journal_stat and journal_stat.st_mtime]
+
+
+@traced
+def get_project_name_index():
+    """Return a TrigramIndex over project folder names and the Agency/Division/Project of every workbook row."""
+    global _project_name_index
+    project_roots = [os.path.join(BASE_DIRECTORY, name) for name in PROJECT_ROOTS]
+    stamp = (tuple(os.stat(root).st_mtime if os.path.isdir(root) else None for root in project_roots), tuple(workbook_stamp()))
+
+    stamped_with, index = _project_name_index
+    if stamped_with == stamp:
+        return index
+
+    index = TrigramIndex()
+    for root in project_roots:
+        if os.path.isdir(root):
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        index.add(entry.name, ('folder', entry.path))
+
+    for sheet in read_workbook_sheets(WORKBOOK_PATH):
+        headers = sheet['headers']
+        columns = [headers[name] for name in ('Agency', 'Department', 'Division', 'Project') if name in headers]
+        if 'Project' not in headers:
+            continue
+        for row_idx, row in enumerate(sheet['rows'][1:], start=2):
+            if row[headers['Project']]:
+                index.add(' '.join(str(row[col]) for col in columns if row[col]), ('row', sheet['title'], row_idx))
+
+    _project_name_index = (stamp, index)
+    return index
+
+
+# Project catalog: one record per project joining its Yes/Done rows to its Active, Closed and Validated Designs
+# folders through the folder name create_projects gives it (build_formatted_project_name). The parts it is built
+# from are kept in PROJECT_CATALOG_PATH; a refresh re-lists only the project roots whose mtime moved and re-reads
+# the rows only when the workbook or its journal changed.
+PROJECT_SHEETS = ("Yes", "Done")
+_project_catalog = {}  # 'parts' as saved, plus 'rows_by_name' and 'by_row' derived from their rows
+
+
+def _empty_catalog_parts():
+    return {'base': BASE_DIRECTORY, 'workbook': WORKBOOK_PATH, 'roots': {}, 'rows': [], 'rows_stamp': None}
+
+
+def _index_catalog_rows(rows):
+    rows_by_name, by_row = {}, {}
+    for row in rows:
+        rows_by_name.setdefault(row[5], []).append(row)
+        by_row[(row[0], row[1])] = row[5]
+    _project_catalog['rows_by_name'], _project_catalog['by_row'] = rows_by_name, by_row
+
+
+@traced
+def refresh_project_catalog():
+    """Bring the catalog up to date: re-list the project roots whose mtime moved, and re-read the Yes/Done rows
+    if the workbook or its journal changed. Each row is kept as [sheet, row number, agency, division, project,
+    folder name]; folder names of rows seen before are reused rather than rebuilt."""
+    parts = _project_catalog.get('parts')
+    if parts is None:
+        try:
+            with open(PROJECT_CATALOG_PATH, 'r', encoding='utf-8') as file:
+                parts = json.load(file)
+        except (OSError, ValueError):
+            pass  # No catalog yet, or unreadable; built below
+        if not parts or parts.get('base') != BASE_DIRECTORY or parts.get('workbook') != WORKBOOK_PATH:
+            parts = _empty_catalog_parts()
+        _project_catalog['parts'] = parts
+        _index_catalog_rows(parts['rows'])
+
+    changed = False
+    for root_name in PROJECT_ROOTS:
+        root = os.path.join(BASE_DIRECTORY, root_name)
+        try:
+            mtime = os.stat(root).st_mtime
+        except OSError:
+            mtime = None
+        known = parts['roots'].get(root_name)
+        if known and known['mtime'] == mtime:
+            continue
+
+        folders = []
+        if mtime is not None:
+            with os.scandir(root) as entries:
+                folders = sorted(entry.name for entry in entries if entry.is_dir())
+        parts['roots'][root_name] = {'mtime': mtime, 'folders': folders}
+        changed = True
+
+    stamp = workbook_stamp()
+    if parts['rows_stamp'] != stamp:
+        known_names = {tuple(row[2:5]): row[5] for row in parts['rows']}
+        rows = []
+        for sheet in read_workbook_sheets(WORKBOOK_PATH):
+            headers = sheet['headers']
+            if sheet['title'] not in PROJECT_SHEETS or 'Project' not in headers:
+                continue
+            for row_number, row in enumerate(sheet['rows'][1:], start=2):
+                cells = project_row_cells(headers, row)
+                if cells[2]:
+                    name = known_names.get(cells) or build_formatted_project_name(*cells)
+                    rows.append([sheet['title'], row_number, *cells, name])
+        parts['rows'], parts['rows_stamp'] = rows, stamp
+        _index_catalog_rows(rows)
+        changed = True
+
+    if changed:
+        # Folder sets for lookups; rebuilt only here, so unchanged runs reuse them
+        _project_catalog.pop('folders', None)
+        try:
+            os.makedirs(os.path.dirname(PROJECT_CATALOG_PATH), exist_ok=True)
+            temp_path = PROJECT_CATALOG_PATH + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write(json.dumps(parts))
+            os.replace(temp_path, PROJECT_CATALOG_PATH)
+        except OSError as e:
+            print(f"Could not save the project catalog: {e}")
+
+    if 'folders' not in _project_catalog:
+        _project_catalog['folders'] = {root_name: set(root['folders']) for root_name, root in parts['roots'].items()}
+
+
+def project_record(name):
+    """Join one project's rows and folders into a record, or return None if neither the workbook nor a project root has it.
+
+    A record is {'name', 'agency', 'division', 'project', 'rows': [[sheet, row number, project]], 'folders': {root: path}}.
+    agency, division and project are the cells of the project's row (its Yes row if it has one), or None for a
+    folder without a row. Call refresh_project_catalog first.
+    """
+    rows = _project_catalog['rows_by_name'].get(name, [])
+    folders = {root_name: os.path.join(BASE_DIRECTORY, root_name, name)
+               for root_name in PROJECT_ROOTS if name in _project_catalog['folders'].get(root_name, ())}
+    if not rows and not folders:
+        return None
+
+    # A project still open is described by its Yes row
+    described_by = next((row for row in rows if row[0] == 'Yes'), rows[0] if rows else None)
+    agency, division, project = described_by[2:5] if described_by else (None, None, None)
+    return {'name': name, 'agency': agency, 'division': division, 'project': project,
+            'rows': [[row[0], row[1], row[4]] for row in rows], 'folders': folders}
+
+
+def find_project_record(path):
+    """Return the catalog record for a project folder, or for any path inside one; None if it isn't in the catalog."""
+    refresh_project_catalog()
+    relative = os.path.relpath(path, BASE_DIRECTORY).split(os.sep)
+    return project_record(relative[1] if len(relative) > 1 and relative[0] in PROJECT_ROOTS else os.path.basename(path))
+
+
+def resolve_search_matches(spreadsheet_matches, matched_folders):
+    """Group spreadsheet (sheet, row) matches and matched folders by project.
+
+    Returns (records, other folders): the records of every project hit either way, in the order first hit, and the
+    matched folders that aren't inside a project folder.
+    """
+    refresh_project_catalog()
+    found, other_folders = {}, []
+    for sheet_title, row_number in spreadsheet_matches:
+        name = _project_catalog['by_row'].get((sheet_title, row_number))
+        if name and name not in found:
+            found[name] = project_record(name)
+    for folder in matched_folders:
+        record = find_project_record(folder)
+        if record:
+            found.setdefault(record['name'], record)
+        else:
+            other_folders.append(folder)
+    return list(found.values()), other_folders
+
+
+def primary_project_folder(record):
+    """The folder to open for a project: Active, else Closed, else Validated Designs; None if it has none."""
+    return next((record['folders'][root_name] for root_name in PROJECT_ROOTS if root_name in record['folders']), None)
+
+
+def describe_project_record(record):
+    """One line per project: folder name, its rows and the roots its folders are in."""
+    rows = ', '.join(f"{sheet_title} row {row_number}" for sheet_title, row_number, _ in record['rows']) or "no workbook row"
+    folders = ', '.join(record['folders']) or "no folder"
+    return f"{record['name']}  ({rows}; {folders})"
+
+
+def get_directories_matching_keyword(keyword, base_directory):
+    """Return the directories one level below the base_directory that match the given keyword, best match first."""
     # Get all entries in the base_directory
-    all_entries = os.listdir(base_directory)
-    for entry in all_entries:
-        full_path = os.path.join(base_directory, entry)
-        # Check if the entry is a directory and matches the keyword
-        if os.path.isdir(full_path) and keyword.lower() in entry.lower():
-            matching_dirs.append(entry)  # Append only the directory name, not the full path
+    all_dirs = [entry for entry in os.listdir(base_directory) if os.path.isdir(os.path.join(base_directory, entry))]
 
-    return matching_dirs
+    # Append only the directory name, not the full path
+    return rank_names(keyword, all_dirs)
 
 
+@traced
 def search_for_project(base_directory):
     print("Please specify your search option:")
     print("1. Keyword search across the entire base directory.")
     print("2. Keyword search within a specific directory.")
     print("3. List all directories.")
 
-    choice = input("Choice: ").strip()
+    choice = timed_input("Choice: ").strip()
 
     # If user selects '1' or starts typing, consider it a search across the entire directory
     if choice == '1' or not choice.isnumeric():
-        keyword = choice if not choice.isnumeric() else input("Enter the keyword for search: ")
+        keyword = choice if not choice.isnumeric() else timed_input("Enter the keyword for search: ")
         directory_path = BASE_DIRECTORY
     elif choice == '2':
-        directory_name = input("Enter the specific directory name (or a part of it): ").strip()
+        directory_name = timed_input("Enter the specific directory name (or a part of it): ").strip()
         directory_path = os.path.join(BASE_DIRECTORY, directory_name)
 
         # If the directory doesn't exist or is only a partial match
@@ -502,7 +2466,7 @@ def search_for_project(base_directory):
                 # Ask the user to select from the list of matching directories
                 while True:
                     try:
-                        dir_selection = int(input("Enter the number of the directory you want to search: "))
+                        dir_selection = int(timed_input("Enter the number of the directory you want to search: "))
                         if 1 <= dir_selection <= len(matching_directories):
                             directory_path = os.path.join(BASE_DIRECTORY, matching_directories[dir_selection - 1])
                             break
@@ -511,7 +2475,7 @@ def search_for_project(base_directory):
                     except ValueError:
                         print("Please enter a valid number.")
 
-        keyword = input("Enter the keyword for search: ")
+        keyword = timed_input("Enter the keyword for search: ")
     elif choice == '3':
         all_directories = [entry for entry in os.listdir(base_directory) if os.path.isdir(os.path.join(base_directory, entry))]
         for idx, directory in enumerate(all_directories, 1):
@@ -520,7 +2484,7 @@ def search_for_project(base_directory):
         # Ask the user to select from the list of all directories
         while True:
             try:
-                dir_selection = int(input("Enter the number of the directory you want to search (or '0' to go back): "))
+                dir_selection = int(timed_input("Enter the number of the directory you want to search (or '0' to go back): "))
                 if 0 <= dir_selection <= len(all_directories):
                     if dir_selection == 0:  # Go back to main menu or quit
                         return  # or break, depending on the rest of your logic
@@ -531,7 +2495,7 @@ def search_for_project(base_directory):
             except ValueError:
                 print("Please enter a valid number.")
 
-        keyword = input("Enter the keyword for search (or press 'Enter' to skip search): ").strip()
+        keyword = timed_input("Enter the keyword for search (or press 'Enter' to skip search): ").strip()
         if not keyword:  # If the user doesn't provide a keyword, return to the main menu or quit
             return  # or break, depending on the rest of your logic
 
@@ -546,7 +2510,7 @@ def search_for_project(base_directory):
         # Ask the user to select from the list of matching directories
         while True:
             try:
-                dir_selection = int(input("Enter the number of the directory you want to search: "))
+                dir_selection = int(timed_input("Enter the number of the directory you want to search: "))
                 if 1 <= dir_selection <= len(matching_directories):
                     directory_path = os.path.join(BASE_DIRECTORY, matching_directories[dir_selection - 1])
                     break
@@ -559,23 +2523,36 @@ def search_for_project(base_directory):
     spreadsheet_path = WORKBOOK_PATH
     matches_in_spreadsheet = search_spreadsheet(keyword, spreadsheet_path)
 
-    print("\nFound in spreadsheet:")
-    for sheet_name, row_num in matches_in_spreadsheet:
-        print(f"Sheet: {sheet_name}, Row: {row_num}")
+    # Ranked matches across folder names and workbook rows; also catches typos and CamelCase folder names
+    closest_matches = get_project_name_index().search(keyword, limit=10)
+    if closest_matches:
+        print("\nClosest matching projects:")
+        for text, payload, score in closest_matches:
+            location = payload[1] if payload[0] == 'folder' else f"Sheet: {payload[1]}, Row: {payload[2]}"
+            print(f"{score:>4.0%}  {text}  ({location})")
 
     # Search the specified directory (or the default BASE_DIRECTORY)
     matched_folders = search_directory(keyword, directory_path)
 
+    # Each project once, with its workbook rows and its folders together
+    found_projects, other_folders = resolve_search_matches(matches_in_spreadsheet, matched_folders)
+    # What each number opens: the project's folder (Active first) or the other folder itself
+    folders_to_open = [primary_project_folder(record) for record in found_projects] + other_folders
+
     while True:  # Keep prompting for folder selection
-        print("\nFound in project folders:")
-        for idx, folder in enumerate(matched_folders, 1):
-            print(f"{idx}. {folder}")
+        print("\nFound projects:")
+        for idx, record in enumerate(found_projects, 1):
+            print(f"{idx}. {describe_project_record(record)}")
+        if other_folders:
+            print("\nOther matching folders:")
+            for idx, folder in enumerate(other_folders, len(found_projects) + 1):
+                print(f"{idx}. {folder}")
 
         # Ask the user to select a folder
         while True:
             try:
-                selection = int(input("\nEnter the number of the project you want to open (or '0' to exit): "))
-                if 0 <= selection <= len(matched_folders):
+                selection = int(timed_input("\nEnter the number of the project you want to open (or '0' to exit): "))
+                if 0 <= selection <= len(folders_to_open):
                     break
                 else:
                     print("Invalid selection. Please enter a number from the list.")
@@ -586,8 +2563,12 @@ def search_for_project(base_directory):
         if selection == 0:
             break
 
+        if folders_to_open[selection - 1] is None:
+            print("That project has no folder yet.")
+            continue
+
         # Open the selected folder
-        folder_to_open = os.path.abspath(matched_folders[selection - 1])
+        folder_to_open = os.path.abspath(folders_to_open[selection - 1])
         if platform.system() == "Darwin":  # macOS
             os.system(f"open \"{folder_to_open}\"")
         elif platform.system() == "Windows":
@@ -607,131 +2588,817 @@ def add_spaces_before_capitals(s):
     return ' '.join(final_words)
 
 
-def close_project_and_copy_to_validated(base_directory, project_folder):
-    try:
-        # Define destination paths
-        closed_projects_folder = os.path.join(base_directory, "Closed Projects")
-        validated_designs_folder = os.path.join(base_directory, "Validated Designs", os.path.basename(project_folder))
+def find_most_recent_vsdx(folder):
+    """Return the path of the newest .vsdx file directly in folder, or None."""
+    vsdx_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".vsdx")]
+    return max(vsdx_files, key=os.path.getmtime) if vsdx_files else None
 
-        # Move the project folder to "Closed Projects"
-        shutil.move(project_folder, os.path.join(closed_projects_folder, os.path.basename(project_folder)))
 
-        print(f"Project folder moved to '{closed_projects_folder}'")
-
-        # Create a folder in "Validated Designs"
-        os.makedirs(validated_designs_folder, exist_ok=True)
-        print(f"Folder created in 'Validated Designs': '{validated_designs_folder}'")
+def copy_file_fast(source, destination):
+    """Copy one file's bytes, letting the kernel do it (copy_file_range) where available, then its timestamps."""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, 64 * 1024 * 1024))
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(source, destination)
+                return
+        except OSError:
+            pass  # Not supported between these file systems; fall back below
+
+    # shutil.copyfile already uses sendfile/fcopyfile where the platform offers them
+    shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+
+
+# Content-addressed store: one copy of each distinct attachment and validated design, kept as
+# BLOB_STORE_DIRECTORY/<first two hex digits>/<sha256>. Project folders get read-only hard links to it, so
+# the store is only used where hard links work. Editable files (the Visio templates) never go through it:
+# they are reflinked from the source where the file system supports that, and copied otherwise.
+_blob_lock = threading.Lock()
+_blob_digests = {}  # (path, size, mtime_ns) -> sha256, so an attachment is hashed once per session
+_blob_links_work = {}  # st_dev of a destination folder -> whether the store can hard-link into it
+_blob_placements = Counter()  # 'link' / 'clone' / 'copy' counts, and bytes under '<how>_bytes'
+
+
+def _remove_read_only(function, path, _):
+    # shutil.rmtree onerror hook: Windows won't delete the read-only hard links placed by place_file
+    os.chmod(path, 0o644)
+    function(path)
+
+
+def _file_digest(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _blob_digests:
+        _blob_digests[key] = hash_file(path)
+    return _blob_digests[key]
+
+
+def store_blob(path):
+    """Add the file's content to the blob store unless it is there already, and return the blob's path.
+
+    The blob is always a copy of its own: linking it to a file someone can still edit (a closed project's
+    diagram, a temp file about to be deleted) would make that file read-only and let an edit change the blob.
+    """
+    digest = _file_digest(path)
+    blob_path = os.path.join(BLOB_STORE_DIRECTORY, digest[:2], digest)
+    if os.path.abspath(path) == os.path.abspath(blob_path):
+        return blob_path  # Already a blob
+    with _blob_lock:
+        if os.path.exists(blob_path):
+            return blob_path
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        temp_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+        copy_file_fast(path, temp_path)
+        _blob_placements['stored_bytes'] += os.path.getsize(temp_path)
+        os.chmod(temp_path, 0o444)
+        os.replace(temp_path, blob_path)
+    return blob_path
+
+
+def _reflink(source, destination):
+    """Clone source to destination sharing its blocks (FICLONE on Linux btrfs/XFS). False where unsupported."""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), 0x40049409, src.fileno())  # FICLONE
+        return True
+    except OSError:
+        os.remove(destination)
+        return False
+
+
+def blob_links_work(folder):
+    """True if the blob store can hard-link into folder: same volume, and a file system that has hard links.
+
+    Tried once per volume with a scratch file, so nothing is stored where every placement would be a copy anyway.
+    """
+    device = os.stat(folder).st_dev
+    if device not in _blob_links_work:
+        os.makedirs(BLOB_STORE_DIRECTORY, exist_ok=True)
+        probe = os.path.join(BLOB_STORE_DIRECTORY, f"link-probe-{uuid.uuid4().hex}.tmp")
+        probe_link = os.path.join(folder, f".link-probe-{uuid.uuid4().hex}.tmp")
+        with open(probe, 'wb'):
+            pass
+        try:
+            os.link(probe, probe_link)
+            os.remove(probe_link)
+            _blob_links_work[device] = True
+        except OSError:
+            _blob_links_work[device] = False
+        finally:
+            os.remove(probe)
+    return _blob_links_work[device]
+
+
+def place_blob(blob_path, destination):
+    """Hard-link the blob at destination and return 'link', or copy it and return 'copy' if the link fails."""
+    if os.path.exists(destination):
+        try:
+            os.remove(destination)
+        except PermissionError:
+            _remove_read_only(os.remove, destination, None)
 
-        # Find the most recent .vsdx file in the project folder
-        vsdx_files = [f for f in os.listdir(os.path.join(closed_projects_folder, os.path.basename(project_folder))) if f.endswith(".vsdx")]
-        if vsdx_files:
-            most_recent_vsdx = max(vsdx_files, key=lambda f: os.path.getmtime(os.path.join(closed_projects_folder, os.path.basename(project_folder), f)))
-            most_recent_vsdx_path = os.path.join(closed_projects_folder, os.path.basename(project_folder), most_recent_vsdx)
-            shutil.copy(most_recent_vsdx_path, os.path.join(validated_designs_folder, most_recent_vsdx))
-            print(f"Most recent .vsdx file copied to 'Validated Designs'")
+    try:
+        os.link(blob_path, destination)
+        return 'link'
+    except OSError:
+        pass
+
+    copy_file_fast(blob_path, destination)
+    os.chmod(destination, 0o644)  # The blob is read-only and copystat brought that along
+    return 'copy'
+
+
+def place_file(source, destination, editable=False):
+    """Copy source to destination, sharing its disk space where the file system allows.
+
+    Files nobody edits (attachments, validated designs) become read-only hard links to one blob in the store.
+    Editable ones (the Visio templates) are reflinked straight from the source where the file system can,
+    otherwise copied; so are read-only files where the store can't hard-link.
+    """
+    how = 'copy'
+    if editable:
+        if _reflink(source, destination):
+            how = 'clone'
         else:
-            print("No .vsdx files found in the project folder.")
+            copy_file_fast(source, destination)
+    elif USE_BLOB_STORE:
+        try:
+            if blob_links_work(os.path.dirname(os.path.abspath(destination))):
+                how = place_blob(store_blob(source), destination)
+            else:
+                copy_file_fast(source, destination)
+        except OSError as e:
+            print(f"Blob store unavailable ({e}), copying '{os.path.basename(source)}' instead.")
+            copy_file_fast(source, destination)
+    else:
+        copy_file_fast(source, destination)
 
-        # Open the "Yes" workbook
-        workbook = openpyxl.load_workbook(WORKBOOK_PATH)
+    with _blob_lock:
+        _blob_placements[how] += 1
+        _blob_placements[f'{how}_bytes'] += os.path.getsize(destination)
+    return how
 
-        # Select the "Yes" worksheet (or specify the actual name)
-        sheet = workbook['Yes']
 
-        # Extract the ProjectName from the full project folder name
-        folder_basename = os.path.basename(project_folder)
+def report_blob_savings():
+    """Print how the files placed since the last report went in, and the disk that saved; then reset the counts."""
+    with _blob_lock:
+        placements = Counter(_blob_placements)
+        _blob_placements.clear()
+    if not placements:
+        return
 
-        folder_parts = folder_basename.rsplit('.', 1)
-        if len(folder_parts) > 1:
-            project_name_raw = folder_parts[-1]
-        else:
-            project_name_raw = folder_parts[0]
+    # Less what went into the store as a copy of its own; a blob placed only once saves nothing yet
+    saved = max(placements['link_bytes'] + placements['clone_bytes'] - placements['stored_bytes'], 0)
+    print(f"Blob store: {placements['link']} hard link(s), {placements['clone']} reflink(s), {placements['copy']} copies; "
+          f"{saved / (1024 * 1024):.1f} MB of disk saved.")
 
-        # Convert ProjectName into Project Name format
-        refined_project_name = add_spaces_before_capitals(project_name_raw)
 
-        # Read the header row to find the "Project" column index
-        header_row = list(sheet.iter_rows(min_row=1, max_row=1, values_only=True))[0]
-        project_column_index = header_row.index("Project") + 1  # Adjust this if the column name is different   
+def print_blob_store_report():
+    """Total up the blob store (the --blob-report option). Hard links are counted; reflinks can't be seen from here."""
+    blobs = stored = saved = 0
+    if os.path.isdir(BLOB_STORE_DIRECTORY):
+        for folder, _, filenames in os.walk(BLOB_STORE_DIRECTORY):
+            for filename in filenames:
+                stat = os.stat(os.path.join(folder, filename))
+                blobs += 1
+                stored += stat.st_size
+                saved += stat.st_size * max(stat.st_nlink - 2, 0)  # The blob plus its first placement are one copy's worth
+
+    print(f"{blobs} blobs, {stored / (1024 * 1024):.1f} MB stored in '{BLOB_STORE_DIRECTORY}'; "
+          f"{saved / (1024 * 1024):.1f} MB saved by hard links.")
+
+
+def _relocation_journal_path(source, destination):
+    key = hashlib.sha1(f"{os.path.abspath(source)}|{os.path.abspath(destination)}".encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIRECTORY, 'relocations', f'{key}.jsonl')
+
+
+def _copy_and_verify(source, destination, relative_path, journal, journal_lock):
+    copy_file_fast(source, destination)
+    source_hash = hash_file(source)
+    if hash_file(destination) != source_hash:
+        raise OSError(f"Checksum mismatch after copying '{relative_path}'")
+
+    stat = os.stat(source)
+    with journal_lock:
+        journal.write(json.dumps({'path': relative_path, 'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': source_hash}) + "\n")
+        journal.flush()
+    return stat.st_size
+
+
+@traced
+def relocate_tree(source, destination):
+    """Move a folder tree, as fast as the two locations allow.
+
+    A rename is tried first. When that is not possible (different volumes or sync roots), the files are
+    copied in parallel, each copy is verified against the source's SHA-256, and the source is deleted only
+    after every file checks out. Verified files are journaled, so an interrupted move resumes where it stopped.
+    """
+    journal_path = _relocation_journal_path(source, destination)
+    resuming = os.path.exists(journal_path)
+
+    if not resuming:
+        if os.path.exists(destination):
+            raise FileExistsError(f"'{destination}' already exists")
+        try:
+            os.rename(source, destination)
+            print(f"Moved '{source}' by renaming it.")
+            return
+        except FileNotFoundError:
+            raise
+        except OSError:
+            pass  # Different volume or sync root; copy instead
+
+    start = time.perf_counter()
+
+    # Files verified by an earlier, interrupted run
+    verified = {}
+    if resuming:
+        with open(journal_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partial last line from the interruption
+                verified[record['path']] = record
+
+    # Work out what still has to be copied
+    to_copy = []
+    skipped = 0
+    for folder, _, filenames in os.walk(source):
+        relative_folder = os.path.relpath(folder, source)
+        os.makedirs(os.path.normpath(os.path.join(destination, relative_folder)), exist_ok=True)
+        for filename in filenames:
+            relative_path = os.path.normpath(os.path.join(relative_folder, filename))
+            source_path = os.path.join(source, relative_path)
+            destination_path = os.path.join(destination, relative_path)
+            record = verified.get(relative_path)
+            stat = os.stat(source_path)
+            if record and record['size'] == stat.st_size and record['mtime'] == stat.st_mtime \
+                    and os.path.exists(destination_path) and os.path.getsize(destination_path) == stat.st_size:
+                skipped += 1
+                continue
+            to_copy.append((source_path, destination_path, relative_path))
+
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    journal_lock = threading.Lock()
+    with open(journal_path, 'a', encoding='utf-8') as journal:
+        with ThreadPoolExecutor(max_workers=RELOCATE_WORKERS) as pool:
+            futures = [pool.submit(_copy_and_verify, source_path, destination_path, relative_path, journal, journal_lock)
+                       for source_path, destination_path, relative_path in to_copy]
+            # result() re-raises the first failure, leaving the source untouched and the journal for a resume
+            copied_bytes = sum(future.result() for future in futures)
+
+    shutil.rmtree(source, onerror=_remove_read_only)
+    os.remove(journal_path)
+
+    elapsed = time.perf_counter() - start
+    throughput = copied_bytes / (1024 * 1024) / elapsed if elapsed else 0
+    resumed_note = f", {skipped} already verified by an earlier run" if skipped else ""
+    print(f"Copied and verified {len(to_copy)} files ({copied_bytes / (1024 * 1024):.1f} MB) in {elapsed:.2f}s, {throughput:.1f} MB/s{resumed_note}.")
+
+
+@traced
+def move_project_folder_to_closed(base_directory, project_folder):
+    """Move a project folder to Closed Projects and copy its newest diagram to Validated Designs."""
+    # Define destination paths
+    closed_projects_folder = os.path.join(base_directory, "Closed Projects")
+    validated_designs_folder = os.path.join(base_directory, "Validated Designs", os.path.basename(project_folder))
+
+    # Move the project folder to "Closed Projects"
+    relocate_tree(project_folder, os.path.join(closed_projects_folder, os.path.basename(project_folder)))
+    session.folders_changed = True
+
+    print(f"Project folder moved to '{closed_projects_folder}'")
+
+    # Create a folder in "Validated Designs"
+    os.makedirs(validated_designs_folder, exist_ok=True)
+    print(f"Folder created in 'Validated Designs': '{validated_designs_folder}'")
+
+    # Find the most recent .vsdx file in the project folder
+    most_recent_vsdx_path = find_most_recent_vsdx(os.path.join(closed_projects_folder, os.path.basename(project_folder)))
+    if most_recent_vsdx_path:
+        place_file(most_recent_vsdx_path, os.path.join(validated_designs_folder, os.path.basename(most_recent_vsdx_path)))
+        print(f"Most recent .vsdx file copied to 'Validated Designs'")
+    else:
+        print("No .vsdx files found in the project folder.")
+
+
+def read_sheet_rows(sheet):
+    """The sheet's header -> column map and its (row number, values) pairs below the header, in one scan."""
+    rows = sheet.iter_rows(values_only=True)
+    headers = {header: idx for idx, header in enumerate(next(rows, ())) if header is not None}
+    return headers, list(enumerate(rows, start=2))
+
+
+@traced
+def delete_rows_in_one_pass(sheet, row_numbers):
+    """Delete several rows, moving every remaining cell at most once.
+
+    Calling delete_rows once per row shifts everything below it each time; here each surviving cell
+    moves up by the number of deleted rows above it, using the same cell move openpyxl's delete_rows uses.
+    """
+    rows_to_delete = sorted(set(row_numbers))
+    if not rows_to_delete:
+        return
+
+    deleted = set(rows_to_delete)
+    for key in [key for key in sheet._cells if key[0] in deleted]:
+        del sheet._cells[key]
+
+    # Ascending order: a cell's destination is either a deleted row or a cell that has already moved up
+    for row, column in sorted(sheet._cells):
+        offset = bisect.bisect_left(rows_to_delete, row)  # Deleted rows above this one
+        if offset:
+            sheet._move_cell(row, column, -offset, 0)
+
+            # openpyxl leaves a moved hyperlink pointing at the old cell, which reappears as a stray row on save
+            cell = sheet._cells[(row - offset, column)]
+            if cell.hyperlink is not None:
+                cell.hyperlink.ref = cell.coordinate
+
+
+@traced
+def close_projects(base_directory, project_folders):
+    """Close several projects: move their folders, then move all their rows from Yes to Done with a single save."""
+    closed_folder_names = []
+    for project_folder in project_folders:
+        try:
+            # Which row goes to Done is decided by the folder name; leave the project open if that is ambiguous
+            record = find_project_record(project_folder)
+            yes_rows = [row_number for sheet_title, row_number, _ in record['rows'] if sheet_title == 'Yes'] if record else []
+            if len(yes_rows) > 1:
+                print(f"Not closing '{os.path.basename(project_folder)}': Yes rows {', '.join(map(str, yes_rows))} all match it. "
+                      f"Give them distinct project names first.")
+                continue
+            move_project_folder_to_closed(base_directory, project_folder)
+            closed_folder_names.append(os.path.basename(project_folder))
+        except Exception as e:
+            print(f"An error occurred closing '{os.path.basename(project_folder)}': {str(e)}")
+    report_blob_savings()
+
+    if not closed_folder_names:
+        return
 
-        found_row_number = None  # Keep track of the row number where the agency was found
+    try:
+        # One journal write for the whole batch; compaction moves the rows to Done in a single save
+        moved = close_project_rows(closed_folder_names)
+        if moved:
+            print(
+                f"{moved} project entries moved to 'Done' worksheet in the 'Status_201705-OnwardCOPY' workbook, and rows deleted from 'Yes'.")
 
-        # Iterate through rows to find the refined project name
-        for row_number, row in enumerate(
-                sheet.iter_rows(min_col=project_column_index, max_col=project_column_index, values_only=True), start=1):
-            if row[0] == refined_project_name:
-                found_row_number = row_number  # Store the row number where the project name was found
-                break
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
 
-        if found_row_number is not None:
-            # Find the entire row with the project name using the stored row number
-            project_row = list(sheet.iter_rows(min_row=found_row_number, max_row=found_row_number, values_only=True))[0]
 
-            # Open the "Done" worksheet within the same workbook
-            done_sheet = workbook['Done']
+def close_project_rows(folder_names):
+    """Journal moving the Yes rows of the named project folders to Done and return how many will move.
+
+    A row belongs to a folder when its Agency, Division and Project build that folder's name, so two projects
+    sharing a Project name in different agencies can't be mixed up. A folder that matches no row, or more than
+    one, is reported and left alone. With a write coordinator running the names are sent to it, so rows are
+    matched against its view of the workbook rather than ours.
+    """
+    if not _coordinator:
+        reply = coordinator_request({'op': 'close', 'folders': folder_names})
+        if reply is not None:
+            if not reply.get('ok'):
+                raise RuntimeError(f"The write coordinator could not close the projects: {reply.get('error')}")
+            return reply['moved']
+
+    with journal_lock():
+        # The Yes sheet as it will be once pending changes are compacted
+        sheet = next(sheet for sheet in read_workbook_sheets(WORKBOOK_PATH) if sheet['title'] == 'Yes')
+        headers = sheet['headers']
+
+        rows_by_folder = {}
+        for row in sheet['rows'][1:]:
+            cells = project_row_cells(headers, row)
+            if cells[2]:
+                rows_by_folder.setdefault(build_formatted_project_name(*cells), []).append(row)
+
+        moves = []
+        for folder_name in dict.fromkeys(folder_names):
+            rows = rows_by_folder.get(folder_name, [])
+            if not rows:
+                print(f"Project '{folder_name}' not found in the 'Yes' worksheet.")
+                continue
+            if len(rows) > 1:
+                print(f"Project '{folder_name}' has {len(rows)} rows in the 'Yes' worksheet; move the right one to 'Done' by hand.")
+                continue
+            moves.append({'op': 'move', 'from': 'Yes', 'to': 'Done', 'folder': folder_name,
+                          'project': rows[0][headers['Project']], 'row': list(rows[0])})
+
+        if moves:
+            record_workbook_changes(moves)
+    return len(moves)
 
-            # Find the next available row in the "Done" worksheet
-            done_row = done_sheet.max_row + 1
 
-            # Copy data from the project row to the "Done" worksheet
-            for col, cell_value in enumerate(project_row, start=1):
-                done_sheet.cell(row=done_row, column=col, value=cell_value)
+def close_project_and_copy_to_validated(base_directory, project_folder):
+    close_projects(base_directory, [project_folder])
 
-            # Apply formatting to the copied row in the "Done" worksheet
-            yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-            for cell in done_sheet[done_row]:
-                cell.font = Font(name='Arial', size=11)
-                cell.alignment = Alignment(horizontal='right') if cell.column in [1, 7] else Alignment(horizontal='left')
-                cell.fill = yellow_fill
 
-            # Delete the row from the "Yes" worksheet
-            sheet.delete_rows(found_row_number)
+# Menu choice -> (email template name, label) for the "design complete" emails
+DESIGN_COMPLETE_EMAILS = {
+    "1": ('psar', 'PSAR'),
+    "2": ('cloud_ir', 'Cloud Implementation Review'),
+}
 
-            # Save changes to the "Yes" workbook (assuming you want to save changes there)
-            workbook.save(WORKBOOK_PATH)
 
-            # Close the workbook
-            workbook.close()
+@traced
+def create_design_complete_email(name, project_folder):
+    """Save a PSAR or Cloud IR "Validated Design is complete" email, with the newest diagram attached, in the project folder."""
+    folder_name = os.path.basename(project_folder)
+    if '.' in folder_name:
+        agency_division, project_name_raw = folder_name.rsplit('.', 1)
+    else:
+        agency_division, project_name_raw = '', folder_name
+    # The names as typed into the workbook, when the catalog can join the folder to its row
+    try:
+        record = find_project_record(project_folder)
+    except Exception as e:
+        print(f"Project catalog unavailable ({str(e)}), going by the folder name.")
+        record = None
+    if record and record['project']:
+        agency_name, project_name = record['agency'], record['project']
+    else:
+        agency_name = agency_division.split('-')[0]
+        project_name = add_spaces_before_capitals(project_name_raw)
 
-            print(
-                f"Project entry moved to 'Done' worksheet in the 'Status_201705-OnwardCOPY' workbook, and row deleted from 'Yes'.")
-        else:
-            print(f"Project '{refined_project_name}' not found in the 'Yes' worksheet.")
+    mail_item = com_call(get_outlook(), 'CreateItemFromTemplate', EMAIL_TEMPLATES[name]['oft'])
+    com_set(mail_item, 'Subject', render_email_subject(name, mail_item.Subject, agency_division, project_name))
+    com_set(mail_item, 'HTMLBody', render_email_body(name, agency_name, project_name))
 
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
+    # The body asks the agency to use the attached diagram
+    vsdx_path = find_most_recent_vsdx(project_folder)
+    if vsdx_path:
+        com_call(mail_item, 'Attachments.Add', vsdx_path)
+    else:
+        print(f"No .vsdx files found in '{project_folder}', email created without a diagram.")
+
+    email_msg_file_path = os.path.join(project_folder, f'{project_name_raw}_{name}_email.msg')
+    com_call(mail_item, 'SaveAs', email_msg_file_path, 3)
+    return email_msg_file_path
+
+
+def create_design_complete_emails(name, project_folders):
+    """Create the design complete email for each project folder; returns how many were saved."""
+    if name not in load_email_templates():
+        return 0
+
+    created = 0
+    for project_folder in project_folders:
+        try:
+            email_msg_file_path = create_design_complete_email(name, project_folder)
+            print(f".msg file saved to project folder: '{email_msg_file_path}'")
+            created += 1
+        except Exception as e:
+            print(f"An error occurred for '{os.path.basename(project_folder)}': {str(e)}")
+
+    print(f"{created} of {len(project_folders)} design complete emails created.")
+    return created
+
+
+class Session:
+    """State kept between runs of the menu loop, so only the first run pays for loading it.
+
+    The workbook is kept open and reloaded only when the file on disk no longer matches what was last
+    read or saved; the snapshot, name index and email templates check their own stamps the same way.
+    """
+
+    def __init__(self):
+        self.workbook = None
+        self.workbook_stamp = None
+        self.snapshots = {}  # workbook path -> (size, mtime, sheets)
+        self.folders_changed = False  # project folders were created or moved, refresh the search index on next use
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get_workbook(self):
+        """Return the open workbook, loading it again only if someone else saved it since."""
+        stamp = self._stamp(WORKBOOK_PATH)
+        if self.workbook is None or stamp != self.workbook_stamp:
+            import openpyxl
+            if self.workbook is not None:
+                print("Workbook changed on disk, reloading it...")
+            with trace_span('load_workbook'):
+                self.workbook = openpyxl.load_workbook(WORKBOOK_PATH)
+            self.workbook_stamp = stamp
+        return self.workbook
+
+    def save_workbook(self):
+        """Save the open workbook and refresh the snapshot from it, so the next search doesn't re-parse the file.
+
+        The workbook is written to a temporary file next to it and swapped in, so a crash mid-save leaves the old copy intact.
+        """
+        temp_path = temp_path_beside(WORKBOOK_PATH, '.xlsx')
+        with trace_span('save_workbook'):
+            try:
+                self.workbook.save(temp_path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+            replace_from_temp(temp_path, WORKBOOK_PATH)
+        self.workbook_stamp = self._stamp(WORKBOOK_PATH)
+
+        with trace_span('refresh snapshot from workbook'):
+            sheets = []
+            for sheet in self.workbook.worksheets:
+                # Empty strings are not written to the file, so they read back as None
+                rows = [tuple(None if value == '' else value for value in row) for row in sheet.iter_rows(values_only=True)]
+                headers = {header: idx for idx, header in enumerate(rows[0]) if header is not None} if rows else {}
+                sheets.append({'title': sheet.title, 'headers': headers, 'rows': rows})
+            save_workbook_snapshot(WORKBOOK_PATH, {'sha256': hash_file(WORKBOOK_PATH), 'sheets': sheets})
+
+    def discard_workbook(self):
+        """Forget unsaved changes; the next get_workbook() reads the file again."""
+        self.workbook = None
+        self.workbook_stamp = None
+
+    def begin_run(self):
+        """Drop anything that can go stale without a file stamp to tell us, before each run of the menu."""
+        # Appointments and their attachments can change between runs
+        calendar_cache.clear()
+
+        # Outlook may have been closed since the last run, which leaves a dead COM handle behind
+        if 'application' in _outlook_session:
+            try:
+                _outlook_session['application'].Version
+            except Exception:
+                print("Lost the connection to Outlook, reconnecting on next use.")
+                _outlook_session.clear()
+
+
+# One per process; the menu loop in __main__ reuses it for every run
+session = Session()
+
+
+# Portfolio analytics (--report): the Yes and Done rows as typed columns, exported to ANALYTICS_DIRECTORY once per
+# workbook change (Parquet when pyarrow is installed, a NumPy .npz otherwise) and summarised with vectorized NumPy.
+# Closed projects have no close date column; the Last Update of their Done row stands in for it.
+PORTFOLIO_COLUMNS = {  # column -> workbook header, matched ignoring case and surrounding spaces
+    'status': None,  # The sheet: Yes or Done
+    'agency': 'Agency',
+    'division': 'Division',
+    'project': 'Project',
+    'project_type': 'On-Prem or Off-Prem',
+    'lsar_date': 'LSAR Date',
+    'last_update': 'Last Update',
+}
+PORTFOLIO_DATE_COLUMNS = ('lsar_date', 'last_update')
+SHEET_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d")
+
+
+def parse_sheet_date(value):
+    """A date cell as a date, whether openpyxl read a datetime or someone typed the date as text; None otherwise."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        for date_format in SHEET_DATE_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), date_format).date()
+            except ValueError:
+                pass
+    return None
+
+
+def build_portfolio_columns(sheets):
+    """Turn the Yes and Done rows into NumPy columns: text as unicode arrays, dates as datetime64[D] with NaT where missing."""
+    import numpy as np
+
+    values = {name: [] for name in PORTFOLIO_COLUMNS}
+    for sheet in sheets:
+        # The sheets don't agree on case ('On-Prem or Off-Prem' on Yes, 'on-prem or off-prem' on Done)
+        headers = {str(header).strip().lower(): idx for header, idx in sheet['headers'].items()}
+        if sheet['title'] not in PROJECT_SHEETS or 'project' not in headers:
+            continue
+        indexes = {name: headers.get(header.lower()) for name, header in PORTFOLIO_COLUMNS.items() if header}
+        if indexes['division'] is None:
+            indexes['division'] = headers.get('department')
+
+        for row in sheet['rows'][1:]:
+            cells = {name: row[index] if index is not None and index < len(row) else None for name, index in indexes.items()}
+            if not cells['project']:
+                continue
+            values['status'].append(sheet['title'])
+            for name in ('agency', 'division', 'project'):
+                values[name].append(str(cells[name]).strip() if cells[name] else '')
+            values['project_type'].append(str(cells['project_type'] or '').strip().lower())
+            for name in PORTFOLIO_DATE_COLUMNS:
+                parsed = parse_sheet_date(cells[name])
+                values[name].append(parsed.isoformat() if parsed else 'NaT')
+
+    return {name: np.array(column, dtype='datetime64[D]' if name in PORTFOLIO_DATE_COLUMNS else str) for name, column in values.items()}
+
+
+def _portfolio_paths():
+    return os.path.join(ANALYTICS_DIRECTORY, 'portfolio.parquet'), os.path.join(ANALYTICS_DIRECTORY, 'portfolio.npz')
+
+
+def export_portfolio(columns, stamp):
+    """Write the columns to ANALYTICS_DIRECTORY, tagged with the workbook stamp they were read at. Returns the path."""
+    import numpy as np
+    parquet_path, npz_path = _portfolio_paths()
+    os.makedirs(ANALYTICS_DIRECTORY, exist_ok=True)
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        pyarrow = None
+
+    if pyarrow is not None:
+        table = pyarrow.table({name: pyarrow.array(column) for name, column in columns.items()})
+        table = table.replace_schema_metadata({'workbook_stamp': json.dumps(stamp)})
+        pyarrow.parquet.write_table(table, parquet_path + '.tmp')
+        os.replace(parquet_path + '.tmp', parquet_path)
+        return parquet_path
+
+    with open(npz_path + '.tmp', 'wb') as file:
+        np.savez(file, workbook_stamp=np.array(json.dumps(stamp)), **columns)
+    os.replace(npz_path + '.tmp', npz_path)
+    return npz_path
+
+
+def _read_portfolio_export(stamp):
+    import numpy as np
+    parquet_path, npz_path = _portfolio_paths()
+    try:
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(parquet_path)
+        if json.loads(table.schema.metadata[b'workbook_stamp']) == stamp:
+            return {name: np.asarray(table.column(name).to_numpy(), dtype='datetime64[D]' if name in PORTFOLIO_DATE_COLUMNS else str)
+                    for name in PORTFOLIO_COLUMNS}
+    except (ImportError, OSError, KeyError, TypeError, ValueError):
+        pass
+    try:
+        with np.load(npz_path) as export:
+            if json.loads(str(export['workbook_stamp'])) == stamp:
+                return {name: export[name] for name in PORTFOLIO_COLUMNS}
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+@traced
+def load_portfolio():
+    """Return the portfolio columns, reading the workbook and exporting them again only if it or its journal changed."""
+    stamp = workbook_stamp()
+    columns = _read_portfolio_export(stamp)
+    if columns is None:
+        columns = build_portfolio_columns(read_workbook_sheets(WORKBOOK_PATH))
+        print(f"Exported {len(columns['project'])} projects to '{export_portfolio(columns, stamp)}'.")
+    return columns
+
+
+def _group_medians(groups, values):
+    """Median of values per group id, vectorized: sort by (group, value) and pick the middle of each run."""
+    import numpy as np
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    lengths = np.diff(np.r_[starts, len(groups)])
+    medians = (values[starts + (lengths - 1) // 2] + values[starts + lengths // 2]) / 2
+    return groups[starts], medians, lengths
+
+
+@traced
+def summarize_portfolio(columns):
+    """Projects per agency, the On-Prem/Off-Prem mix, LSARs per year and LSAR-to-close cycle times, as plain Python values."""
+    import numpy as np
+    closed = columns['status'] == 'Done'
+
+    def open_closed_counts(column):
+        names, index = np.unique(column, return_inverse=True)
+        open_counts = np.bincount(index[~closed], minlength=len(names))
+        closed_counts = np.bincount(index[closed], minlength=len(names))
+        return [(str(name) or '(blank)', int(o), int(c)) for name, o, c in zip(names, open_counts, closed_counts)]
+
+    lsar_dates = columns['lsar_date']
+    has_lsar = ~np.isnat(lsar_dates)
+    years, year_counts = np.unique(lsar_dates[has_lsar].astype('datetime64[Y]').astype(int) + 1970, return_counts=True)
+
+    # Closed projects with both dates; a Last Update before the LSAR is a typo, not a cycle time
+    agency_names, agency_index = np.unique(columns['agency'], return_inverse=True)
+    with_dates = closed & has_lsar & ~np.isnat(columns['last_update'])
+    days = (columns['last_update'][with_dates] - lsar_dates[with_dates]).astype(np.int64)
+    valid = days >= 0
+    days, day_agencies = days[valid], agency_index[with_dates][valid]
+
+    cycle = None
+    if days.size:
+        groups, medians, counts = _group_medians(day_agencies, days)
+        cycle = {
+            'count': int(days.size),
+            'median': float(np.median(days)),
+            'mean': float(days.mean()),
+            'p90': float(np.percentile(days, 90)),
+            'by_agency': sorted(((str(agency_names[group]) or '(blank)', float(median), int(count)) for group, median, count in zip(groups, medians, counts)),
+                                key=lambda item: -item[2]),
+        }
+
+    return {
+        'projects': int(closed.size),
+        'open': int((~closed).sum()),
+        'closed': int(closed.sum()),
+        'by_agency': sorted(open_closed_counts(columns['agency']), key=lambda item: -(item[1] + item[2])),
+        'by_type': open_closed_counts(columns['project_type']),
+        'lsars_per_year': [(int(year), int(count)) for year, count in zip(years, year_counts)],
+        'cycle_days': cycle,
+    }
+
+
+def print_portfolio_report():
+    """The --report option: export Yes/Done if they changed and print the portfolio summary."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("The portfolio report needs NumPy: pip install numpy (and pyarrow for a Parquet export).")
+        return
+
+    start = time.perf_counter()
+    columns = load_portfolio()
+    loaded = time.perf_counter() - start
+    summary = summarize_portfolio(columns)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{summary['projects']} projects: {summary['open']} open (Yes), {summary['closed']} closed (Done)")
+
+    print(f"\n{'Agency':<24}{'Open':>7}{'Closed':>8}{'Total':>8}")
+    for name, open_count, closed_count in summary['by_agency']:
+        print(f"{name:<24}{open_count:>7}{closed_count:>8}{open_count + closed_count:>8}")
+
+    print(f"\n{'On-Prem or Off-Prem':<24}{'Open':>7}{'Closed':>8}{'Share':>8}")
+    for name, open_count, closed_count in summary['by_type']:
+        print(f"{name:<24}{open_count:>7}{closed_count:>8}{(open_count + closed_count) / max(summary['projects'], 1):>8.0%}")
+
+    print("\nLSARs per year: " + ", ".join(f"{year}: {count}" for year, count in summary['lsars_per_year']))
+
+    cycle = summary['cycle_days']
+    if cycle:
+        print(f"\nLSAR to close, {cycle['count']} closed projects with both dates: median {cycle['median']:.0f} days, "
+              f"mean {cycle['mean']:.0f}, 90th percentile {cycle['p90']:.0f}")
+        print(f"{'Agency':<24}{'Median days':>12}{'Projects':>10}")
+        for name, median, count in cycle['by_agency']:
+            print(f"{name:<24}{median:>12.0f}{count:>10}")
+    else:
+        print("\nNo closed project has both an LSAR date and a Last Update to measure.")
+
+    print(f"\nReport over {summary['projects']} projects in {elapsed:.3f}s ({loaded:.3f}s loading the columns).")
 
 
 def main():
     print("Choose an option:")
     print("1: Create a project")
     print("2: Search for a project")
-    print("3: Close out a project")
-    choice = input("Enter your choice (1/2/3): ")
+    print("3: Close out projects")
+    print("4: Create design complete emails (PSAR / Cloud IR)")
+    choice = timed_input("Enter your choice (1/2/3/4): ")
+
+    if choice in ("1", "4"):
+        # These paths end in Outlook; get it starting while the user keeps typing
+        warm_up_outlook()
 
     if choice == "1":
         print("Where will this project start (Select the number that applies)?")
         print("1) LSAR")
         print("2) Validated Design")
-        start_choice = input("Enter your choice (1/2): ")
+        print("3) Import projects from a manifest file (CSV or JSONL)")
+        start_choice = timed_input("Enter your choice (1/2/3): ")
 
         if start_choice == "1":
             # Existing code for LSAR
-            workbook = openpyxl.load_workbook(WORKBOOK_PATH)
-            num_projects = int(input("Enter the number of projects to create: "))
-            create_projects(workbook, num_projects)
-            workbook.save(WORKBOOK_PATH)
+            num_projects = int(timed_input("Enter the number of projects to create: "))
+            create_projects(num_projects)
 
         elif start_choice == "2":
             # Code for Validated Design
             # Omitted the part for LSAR date and LSAR related function calls
-            workbook = openpyxl.load_workbook(WORKBOOK_PATH)
-            num_projects = int(input("Enter the number of projects to create without LSAR: "))
-            create_projects_no_lsar(workbook, num_projects)  # This function should be defined to create projects without LSAR
-            workbook.save(WORKBOOK_PATH)
+            num_projects = int(timed_input("Enter the number of projects to create without LSAR: "))
+            create_projects_no_lsar(num_projects)  # This function should be defined to create projects without LSAR
+
+        elif start_choice == "3":
+            # Non-interactive intake: one row per project, columns named after the Yes-sheet headers
+            manifest_path = timed_input("Enter the path of the manifest file: ").strip().strip('"')
+            create_projects_from_manifest(manifest_path)
 
         else:
-            print("Invalid choice for project start. Please enter either 1 or 2.")
+            print("Invalid choice for project start. Please enter either 1, 2 or 3.")
 
     elif choice == "2":
         base_directory = BASE_DIRECTORY
@@ -739,23 +3406,168 @@ def main():
 
     elif choice == "3":
         base_directory = BASE_DIRECTORY
-        project_folder = search_and_select_project(base_directory)
-        if project_folder:
-            close_project_and_copy_to_validated(base_directory, project_folder)
+        project_folders = search_and_select_project(base_directory, multiple=True)
+        if project_folders:
+            close_projects(base_directory, project_folders)
+
+    elif choice == "4":
+        print("Which next step is the project moving to?")
+        for key, (_, label) in DESIGN_COMPLETE_EMAILS.items():
+            print(f"{key}) {label}")
+        email_choice = timed_input("Enter your choice (1/2): ").strip()
+
+        if email_choice in DESIGN_COMPLETE_EMAILS:
+            project_folders = search_and_select_project(BASE_DIRECTORY, action="email", multiple=True)
+            if project_folders:
+                create_design_complete_emails(DESIGN_COMPLETE_EMAILS[email_choice][0], project_folders)
+        else:
+            print("Invalid choice. Please enter either 1 or 2.")
 
     else:
-        print("Invalid choice. Please enter either 1, 2, or 3.")
+        print("Invalid choice. Please enter either 1, 2, 3 or 4.")
+
+    return MENU_PATHS.get(choice)
+
+
+# Menu choice -> name used in the startup timings
+MENU_PATHS = {
+    "1": "create",
+    "2": "search",
+    "3": "close",
+    "4": "design-complete-email",
+}
+
+# Seconds spent waiting at prompts, so startup timings measure the program and not the user
+_input_wait = [0.0]
+
+
+def timed_input(prompt=''):
+    """input(), adding the time spent waiting for the user to _input_wait."""
+    start = time.perf_counter()
+    try:
+        return input(prompt)
+    finally:
+        _input_wait[0] += time.perf_counter() - start
+
+
+def process_start_time():
+    """Return when this process was created (time.time() scale), including the frozen executable's bootloader.
+
+    Only Windows exposes this without extra packages; elsewhere the module start is the best we have.
+    """
+    if platform.system() == "Windows":
+        import ctypes
+        from ctypes import wintypes
+        creation, exited, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+        kernel32 = ctypes.windll.kernel32
+        if kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+            # FILETIME counts 100ns ticks since 1601-01-01
+            return ((creation.dwHighDateTime << 32) | creation.dwLowDateTime) / 1e7 - 11644473600
+    return time.time() - (time.perf_counter() - _module_start)
+
+
+def record_cold_start(menu_path, menu_seconds, action_seconds):
+    """Append one cold-start measurement to startup_times.jsonl in the cache directory."""
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'menu_path': menu_path,
+        'frozen': bool(getattr(sys, 'frozen', False)),
+        'seconds_to_menu': round(menu_seconds, 3),
+        'first_action_seconds': round(action_seconds, 3),
+    }
+    try:
+        os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+        with open(os.path.join(CACHE_DIRECTORY, 'startup_times.jsonl'), 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + "\n")
+    except OSError:
+        pass  # Timings are a nice-to-have
+
+
+def print_startup_report():
+    """Summarize startup_times.jsonl: median time to menu and to the end of the first action, per menu path."""
+    try:
+        with open(os.path.join(CACHE_DIRECTORY, 'startup_times.jsonl'), 'r', encoding='utf-8') as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    except OSError:
+        print("No startup timings recorded yet.")
+        return
+
+    by_path = {}
+    for record in records:
+        key = (record['menu_path'], 'exe' if record['frozen'] else 'script')
+        by_path.setdefault(key, []).append(record)
+
+    print(f"{'Menu path':<24}{'Build':<8}{'Runs':>6}{'To menu (s)':>13}{'+ action (s)':>14}")
+    for (menu_path, build), runs in sorted(by_path.items()):
+        to_menu = statistics.median(run['seconds_to_menu'] for run in runs)
+        action = statistics.median(run['first_action_seconds'] for run in runs)
+        print(f"{menu_path:<24}{build:<8}{len(runs):>6}{to_menu:>13.2f}{action:>14.2f}")
 
 
 if __name__ == "__main__":
-    # Initialize the Outlook object once
-    outlook = win32com.client.Dispatch('Outlook.Application')
-    namespace = outlook.GetNamespace("MAPI")
-    recipient = namespace.CreateRecipient(SHARED_MAILBOX_EMAIL)
-    shared_calendar = namespace.GetSharedDefaultFolder(recipient, 9)
+    # Needed for the sheet-scanning worker processes in the frozen executable
+    multiprocessing.freeze_support()
+
+    # Write the trace however the script ends, including the sys.exit paths below
+    if PROFILE_ENABLED:
+        atexit.register(write_profile_trace)
+
+    # Run as the only writer of the shared workbook until Ctrl+C: --coordinator
+    if "--coordinator" in sys.argv[1:]:
+        run_write_coordinator()
+        sys.exit(0)
+
+    # Journaled workbook changes are compacted in the background and once more on the way out
+    atexit.register(compact_workbook_journal_on_exit)
+    start_journal_compactor()
+
+    # Rebuild the search index from scratch and exit
+    if "--reindex" in sys.argv[1:]:
+        rebuild_search_index()
+        sys.exit(0)
+
+    # Show the recorded cold-start timings and exit
+    if "--startup-report" in sys.argv[1:]:
+        print_startup_report()
+        sys.exit(0)
+
+    # Show what the blob store holds and the disk its hard links save, and exit
+    if "--blob-report" in sys.argv[1:]:
+        print_blob_store_report()
+        sys.exit(0)
+
+    # Projects per agency, On-Prem/Off-Prem mix and LSAR-to-close cycle times from Yes/Done, and exit
+    if "--report" in sys.argv[1:]:
+        print_portfolio_report()
+        sys.exit(0)
+
+    # Check every email template once up front so a broken body is reported before any project is created
+    load_email_templates()
+
+    # Create every project in a manifest and exit: --manifest <file.csv|file.jsonl>
+    if "--manifest" in sys.argv[1:]:
+        manifest_index = sys.argv.index("--manifest") + 1
+        if manifest_index >= len(sys.argv) or sys.argv[manifest_index].startswith("--"):
+            print("Usage: Project_MASTER --manifest <file.csv|file.jsonl>")
+            sys.exit(2)
+        warm_up_outlook()
+        create_projects_from_manifest(sys.argv[manifest_index])
+        sys.exit(0)
+
+    # Outlook is no longer opened here; get_outlook() connects the first time a menu path needs it
+    menu_seconds = time.time() - process_start_time()
+    first_run = True
 
     while True:
-        main()
-        choice = input("Run script again? (y/n): ").lower()
+        session.begin_run()
+        action_start = time.perf_counter()
+        waited_before = _input_wait[0]
+        with trace_span('menu run'):
+            menu_path = main()
+        if first_run and menu_path:
+            record_cold_start(menu_path, menu_seconds, time.perf_counter() - action_start - (_input_wait[0] - waited_before))
+        first_run = False
+
+        choice = timed_input("Run script again? (y/n): ").lower()
         if choice != 'y':
-            break
\ No newline at end of file
+            break
@@ -0,0 +1,763 @@
+import os
+import time
+import shutil
+import argparse
+import random
+import tempfile
+import io
+import csv
+import json
+import re
+import tracemalloc
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout, contextmanager
+from datetime import datetime, timedelta
+
+from docx import Document
+from docx.shared import Pt
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+import Project_MASTER
+
+
+def legacy_status_sheet(folder_path, docx_title, lsar_date):
+    """The STATUS_SHEET build used before the template cache: a fresh Document per project."""
+    os.makedirs(folder_path, exist_ok=True)
+    docx_file_path = os.path.join(folder_path, f'{docx_title}.docx')
+    doc = Document()
+
+    for style in doc.styles:
+        if style.name == 'Normal':
+            style.font.name = 'Arial'
+            style.font.size = Pt(12)
+
+    p = doc.add_paragraph()
+    p.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+    run = p.add_run(lsar_date.strftime("%m/%d/%Y"))
+    run.bold = True
+    p.add_run(" - LSAR held; welcome packet sent.")
+
+    doc.save(docx_file_path)
+    return docx_file_path
+
+
+def legacy_append_project_row(sheet, data):
+    """The row append used before write_project_rows: new style objects for every cell of every row."""
+    from openpyxl.styles import PatternFill, Font, Alignment
+
+    sheet.append([*data])
+    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    for cell in sheet[sheet.max_row]:
+        cell.font = Font(name='Arial', size=11)
+        cell.alignment = Alignment(horizontal='right') if cell.column in [1, 7] else Alignment(horizontal='left')
+        cell.fill = yellow_fill
+
+
+def time_per_item(label, count, function):
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{count:>8}{elapsed:>11.2f}s{elapsed / count * 1000:>11.2f} ms/item")
+    return elapsed
+
+
+def benchmark_status_sheets(count, work_dir):
+    """Compare building STATUS_SHEET docx files from scratch against stamping the cached template."""
+    lsar_date = datetime(2024, 5, 14)
+    legacy_dir = os.path.join(work_dir, "legacy")
+    cached_dir = os.path.join(work_dir, "cached")
+
+    print(f"\nSTATUS_SHEET docx ({count} projects)")
+    before = time_per_item("Document() per project", count, lambda i: legacy_status_sheet(os.path.join(legacy_dir, f"P{i}"), f"AG.Project{i}.STATUS_SHEET", lsar_date))
+    after = time_per_item("Cached template", count, lambda i: Project_MASTER.create_folder_and_docx(os.path.join(cached_dir, f"P{i}"), f"AG.Project{i}.STATUS_SHEET", lsar_date, is_lsar=True))
+    print(f"Speed-up: {before / after:.1f}x")
+
+
+def benchmark_row_writer(count, work_dir):
+    """Append count highlighted rows to a Yes-like sheet cell by cell, then with write_project_rows, and save each."""
+    import openpyxl
+    rows = [['05/14/2024', 'No', 'DOH', 'IT', f"Project {i}", 'On-Prem', '06/01/2024', 'BXA', 'Welcome packet sent'] for i in range(count)]
+
+    print(f"\nHighlighted row append ({count} rows)")
+    timings = {}
+    for label in ("Per-cell styles", "write_project_rows"):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Yes'
+        sheet.append(STATUS_HEADERS)
+
+        start = time.perf_counter()
+        if label == "Per-cell styles":
+            for row in rows:
+                legacy_append_project_row(sheet, row)
+        else:
+            Project_MASTER.write_project_rows(sheet, rows)
+        write_seconds = time.perf_counter() - start
+        workbook.save(os.path.join(work_dir, f"{label.replace(' ', '_')}.xlsx"))
+        timings[label] = time.perf_counter() - start
+        print(f"{label:<28}{write_seconds:>10.2f}s to write{timings[label]:>10.2f}s with save")
+    print(f"Speed-up: {timings['Per-cell styles'] / timings['write_project_rows']:.1f}x")
+
+
+def synthetic_project_names(count, seed=1):
+    """Folder-style names ('Agency.WordWordWord') built from a few thousand made-up words."""
+    rng = random.Random(seed)
+    syllables = ['ba', 'con', 'de', 'ex', 'fi', 'gra', 'hub', 'in', 'jo', 'ka', 'lo', 'man', 'net', 'op', 'pro', 'que',
+                 'ra', 'sys', 'tem', 'up', 'vi', 'web', 'xa', 'yo', 'zen', 'ser', 'ver', 'por', 'tal', 'da', 'ta', 'oud']
+    vocabulary = sorted({''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(3000)})
+    agencies = ['DOH', 'MVC', 'TRE', 'DOT', 'OIT', 'DCA', 'LWD', 'DEP', 'DHS', 'DCF', 'AG', 'BPU']
+    return [f"{rng.choice(agencies)}.{''.join(word.capitalize() for word in rng.sample(vocabulary, rng.randint(2, 4)))}" for _ in range(count)]
+
+
+def benchmark_trigram_search(count):
+    """Build a TrigramIndex over count names and time ranked queries (partial names with a typo)."""
+    names = synthetic_project_names(count)
+    rng = random.Random(2)
+
+    start = time.perf_counter()
+    index = Project_MASTER.TrigramIndex()
+    for name in names:
+        index.add(name)
+    print(f"\nTrigram index over {count} names built in {time.perf_counter() - start:.2f}s")
+
+    queries = []
+    for name in rng.sample(names, 200):
+        query = list(name.split('.', 1)[1][:rng.randint(6, 16)])
+        position = rng.randrange(len(query))
+        query[position] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        queries.append(''.join(query))
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=10)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{len(queries)} queries: median {timings[len(timings) // 2]:.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms")
+
+
+# Columns of the Yes and Done sheets in the real Status workbook
+STATUS_HEADERS = ['LSAR Date', 'eReview (Yes / No / NA)', 'Agency', 'Division', 'Project', 'On-Prem or Off-Prem',
+                  'Last Update', 'Updated By', 'Latest Status Summary']
+# The real Done sheet's headers differ from Yes in wording and case
+DONE_HEADERS = ['LSAR Date', 'eReview (Yes or No)', 'Agency', 'Division', 'Project', 'on-prem or off-prem',
+                'Last Update', 'Updated By', 'Latest Status Summary']
+AGENCIES = ['DOH', 'MVC', 'TRE', 'DOT', 'OIT', 'DCA', 'LWD', 'DEP', 'DHS', 'DCF', 'AG', 'BPU']
+DIVISIONS = ['', 'IT', 'Finance', 'Licensing', 'Records', 'Grants']
+LSAR_DATES = [datetime(2024, 5, 14) + timedelta(days=7 * week) for week in range(4)]
+
+
+class FakeAttachments(list):
+    def Add(self, path):
+        self.append(path)
+
+
+class FakeMailItem:
+    """Just enough of an Outlook MailItem for the create and design complete flows."""
+
+    def __init__(self, template_path):
+        self.Subject = os.path.splitext(os.path.basename(template_path))[0]
+        self.HTMLBody = ''
+        self.Attachments = FakeAttachments()
+
+    def SaveAs(self, path, file_format):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.Subject + "\n" + self.HTMLBody)
+
+
+class FakeOutlook:
+    Version = 'benchmark'
+
+    def CreateItemFromTemplate(self, template_path):
+        return FakeMailItem(template_path)
+
+
+def synthetic_projects(count, seed=1):
+    """(agency, division, project name) tuples whose folder names are all distinct."""
+    rng = random.Random(seed)
+    vocabulary = sorted({name.split('.', 1)[1][:rng.randint(4, 9)].lower() for name in synthetic_project_names(4000, seed)})
+    projects, folder_names = [], set()
+    while len(projects) < count:
+        project = (rng.choice(AGENCIES), rng.choice(DIVISIONS), ' '.join(word.capitalize() for word in rng.sample(vocabulary, rng.randint(2, 4))))
+        folder_name = Project_MASTER.build_formatted_project_name(*project)
+        if folder_name not in folder_names:
+            folder_names.add(folder_name)
+            projects.append(project)
+    return projects
+
+
+def write_filler(path, size, rng):
+    with open(path, 'wb') as file:
+        file.write(rng.randbytes(size))
+
+
+def build_synthetic_tree(base_directory, projects, file_kb=4, seed=1):
+    """Lay out Active (60%), Closed (30%) and Validated Designs (10%) folders with the files a real project has.
+
+    Returns {folder name: (root name, project)}.
+    """
+    rng = random.Random(seed)
+    for root_name in ("Active Projects", "Closed Projects", "Validated Designs"):
+        os.makedirs(os.path.join(base_directory, root_name), exist_ok=True)
+
+    layout = {}
+    for i, project in enumerate(projects):
+        root_name = "Active Projects" if i % 10 < 6 else "Closed Projects" if i % 10 < 9 else "Validated Designs"
+        folder_name = Project_MASTER.build_formatted_project_name(*project)
+        folder_path = os.path.join(base_directory, root_name, folder_name)
+        os.makedirs(os.path.join(folder_path, "LSAR Meeting Documents"), exist_ok=True)
+        write_filler(os.path.join(folder_path, f"{folder_name}.STATUS_SHEET.docx"), file_kb * 1024, rng)
+        write_filler(os.path.join(folder_path, f"OnPrem-{folder_name}-DESIGN.vsdx"), file_kb * 1024, rng)
+        write_filler(os.path.join(folder_path, "LSAR Meeting Documents", "agenda.pdf"), file_kb * 1024, rng)
+        layout[folder_name] = (root_name, project)
+    return layout
+
+
+def build_synthetic_workbook(workbook_path, layout, seed=1):
+    """Write a Status workbook with a Yes row for every active project and a Done row for the rest."""
+    import openpyxl
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook()
+    yes_sheet = workbook.active
+    yes_sheet.title = 'Yes'
+    done_sheet = workbook.create_sheet('Done')
+    yes_sheet.append(STATUS_HEADERS)
+    done_sheet.append(DONE_HEADERS)
+
+    for root_name, (agency, division, project_name) in layout.values():
+        sheet = yes_sheet if root_name == "Active Projects" else done_sheet
+        sheet.append([rng.choice(LSAR_DATES), rng.choice(['Yes', 'No', 'NA']), agency, division, project_name,
+                      rng.choice(['On-Prem', 'Off-Prem']), datetime(2024, 6, 1) + timedelta(days=rng.randrange(300)), 'BXA',
+                      f"Waiting on {rng.choice(AGENCIES)} for the {rng.choice(['design', 'firewall', 'network'])} review"])
+    workbook.save(workbook_path)
+
+
+def build_synthetic_calendar(calendar_directory, file_kb=4):
+    """appointments.json for LocalCalendar: one LSAR meeting with two attachments on each benchmark LSAR date."""
+    rng = random.Random(3)
+    os.makedirs(calendar_directory, exist_ok=True)
+    for name in ('agenda.docx', 'architecture.pdf'):
+        write_filler(os.path.join(calendar_directory, name), file_kb * 1024, rng)
+    appointments = [{'subject': 'LSAR', 'start': lsar_date.replace(hour=9).isoformat(), 'end': lsar_date.replace(hour=11).isoformat(),
+                     'attachments': ['agenda.docx', 'architecture.pdf']} for lsar_date in LSAR_DATES]
+    with open(os.path.join(calendar_directory, 'appointments.json'), 'w', encoding='utf-8') as file:
+        json.dump(appointments, file)
+
+
+def use_synthetic_environment(work_dir, scale, file_kb):
+    """Generate a project tree, workbook and calendar under work_dir and point Project_MASTER at them."""
+    base_directory = os.path.join(work_dir, "base")
+    projects = synthetic_projects(scale)
+    layout = build_synthetic_tree(base_directory, projects, file_kb)
+    workbook_path = os.path.join(work_dir, "Status.xlsx")
+    build_synthetic_workbook(workbook_path, layout)
+
+    template_directory = os.path.join(work_dir, "templates")
+    os.makedirs(template_directory, exist_ok=True)
+    for name in ("OnPrem-SA-Example-Diagram.vsdx", "OffPrem-SA-Example-Diagram.vsdx"):
+        write_filler(os.path.join(template_directory, name), file_kb * 1024, random.Random(name))
+    build_synthetic_calendar(os.path.join(work_dir, "calendar"), file_kb)
+
+    Project_MASTER.BASE_DIRECTORY = base_directory
+    Project_MASTER.WORKBOOK_PATH = workbook_path
+    Project_MASTER.CACHE_DIRECTORY = os.path.join(work_dir, "cache")
+    Project_MASTER.SEARCH_INDEX_PATH = os.path.join(work_dir, "cache", "search_index.sqlite3")
+    Project_MASTER.PROJECT_CATALOG_PATH = os.path.join(work_dir, "cache", "project_catalog.json")
+    Project_MASTER.ANALYTICS_DIRECTORY = os.path.join(work_dir, "cache", "analytics")
+    Project_MASTER.BLOB_STORE_DIRECTORY = os.path.join(base_directory, ".blobstore")
+    Project_MASTER.ON_PREM_VISIO_TEMPLATE = os.path.join(template_directory, "OnPrem-SA-Example-Diagram.vsdx")
+    Project_MASTER.OFF_PREM_VISIO_TEMPLATE = os.path.join(template_directory, "OffPrem-SA-Example-Diagram.vsdx")
+    Project_MASTER.EMAIL_TEMPLATE = os.path.join(template_directory, "LSAR follow up.oft")
+    Project_MASTER._outlook_session.clear()
+    Project_MASTER._outlook_session['application'] = FakeOutlook()
+    Project_MASTER._outlook_session['calendar'] = Project_MASTER.LocalCalendar(os.path.join(work_dir, "calendar"))
+    Project_MASTER.calendar_cache.clear()
+    Project_MASTER._project_name_index = (None, None)
+    Project_MASTER._project_catalog.clear()
+    Project_MASTER.session = Project_MASTER.Session()
+    return layout
+
+
+def measure(label, count, run, reset=None):
+    """Time run(0), then repeat it as run(1) under tracemalloc for the peak memory. Output of both is discarded.
+
+    reset() is called before each round so cold-start measurements start cold both times.
+    """
+    if reset:
+        reset()
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run(0)
+        elapsed = time.perf_counter() - start
+
+    if reset:
+        reset()
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            run(1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {'operation': label, 'count': count, 'seconds': round(elapsed, 4),
+              'per_second': round(count / elapsed, 1) if elapsed else None, 'peak_mb': round(peak / (1024 * 1024), 2)}
+    print(f"{label:<38}{count:>7}{elapsed:>10.3f}s{result['per_second'] or 0:>11.1f}/s{result['peak_mb']:>10.2f} MB")
+    return result
+
+
+def write_manifest(manifest_path, projects):
+    with open(manifest_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(STATUS_HEADERS)
+        for i, (agency, division, project_name) in enumerate(projects):
+            lsar_date = LSAR_DATES[i % len(LSAR_DATES)].strftime("%m/%d/%Y") if i % 2 == 0 else ''
+            writer.writerow([lsar_date, 'No' if lsar_date else '', agency, division, project_name, 'On-Prem' if i % 3 else 'Off-Prem', '', '', ''])
+
+
+def remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def benchmark_workflows(scales, operations, file_kb, work_dir):
+    """Time search, create and close against a generated project tree and workbook at each scale."""
+    results = []
+    for scale in scales:
+        scale_dir = os.path.join(work_dir, f"scale_{scale}")
+        start = time.perf_counter()
+        layout = use_synthetic_environment(scale_dir, scale, file_kb)
+        print(f"\n{scale} projects / workbook rows (generated in {time.perf_counter() - start:.1f}s)")
+        print(f"{'Operation':<38}{'Count':>7}{'Time':>11}{'Throughput':>13}{'Peak':>13}")
+
+        rng = random.Random(scale)
+        queries = [rng.choice(project[2].split()).lower() for _, project in rng.sample(sorted(layout.values()), min(operations * 2, len(layout)))]
+        query_rounds = [queries[:operations], queries[operations:] or queries[:operations]]
+        snapshot_path = os.path.splitext(Project_MASTER.WORKBOOK_PATH)[0] + '.snapshot.json'
+
+        def reset_index():
+            remove_if_exists(Project_MASTER.SEARCH_INDEX_PATH)
+
+        def reset_catalog():
+            remove_if_exists(Project_MASTER.PROJECT_CATALOG_PATH)
+            Project_MASTER._project_catalog.clear()
+
+        def reset_snapshot():
+            remove_if_exists(snapshot_path)
+            Project_MASTER.session.snapshots.clear()
+
+        rows = [
+            measure("search_directory (index build)", 1, lambda r: Project_MASTER.search_directory(query_rounds[r][0], Project_MASTER.BASE_DIRECTORY), reset_index),
+            measure("search_directory (warm)", operations, lambda r: [Project_MASTER.search_directory(q, Project_MASTER.BASE_DIRECTORY) for q in query_rounds[r]]),
+            measure("search_spreadsheet (snapshot build)", 1, lambda r: Project_MASTER.search_spreadsheet(query_rounds[r][0], Project_MASTER.WORKBOOK_PATH), reset_snapshot),
+            measure("search_spreadsheet (warm)", operations, lambda r: [Project_MASTER.search_spreadsheet(q, Project_MASTER.WORKBOOK_PATH) for q in query_rounds[r]]),
+            measure("refresh_project_catalog (build)", 1, lambda r: Project_MASTER.refresh_project_catalog(), reset_catalog),
+            measure("find_project_record (warm)", operations, lambda r: [Project_MASTER.find_project_record(folder) for folder in list(layout)[:operations]]),
+        ]
+
+        # New projects, distinct from the generated ones (different seed, filtered by folder name)
+        new_projects = [project for project in synthetic_projects(operations * 4, seed=scale + 7) if Project_MASTER.build_formatted_project_name(*project) not in layout][:operations * 2]
+        manifest_paths = [os.path.join(scale_dir, f"manifest_{r}.csv") for r in range(2)]
+        for r, manifest_path in enumerate(manifest_paths):
+            write_manifest(manifest_path, new_projects[r * operations:(r + 1) * operations])
+
+        # Both include the compaction that writes the journaled rows to the workbook
+        def create_round(r):
+            Project_MASTER.create_projects_from_manifest(manifest_paths[r])
+            Project_MASTER.compact_workbook_journal()
+
+        rows.append(measure("create_projects (manifest batch)", operations, create_round))
+
+        active_projects = sorted(os.path.join(Project_MASTER.BASE_DIRECTORY, root_name, folder_name)
+                                 for folder_name, (root_name, _) in layout.items() if root_name == "Active Projects")
+        close_rounds = [active_projects[:operations], active_projects[operations:operations * 2]]
+
+        def close_round(r):
+            for project_folder in close_rounds[r]:
+                Project_MASTER.close_project_and_copy_to_validated(Project_MASTER.BASE_DIRECTORY, project_folder)
+            Project_MASTER.compact_workbook_journal()
+
+        rows.append(measure("close_project_and_copy_to_validated", len(close_rounds[0]), close_round))
+
+        for row in rows:
+            row['scale'] = scale
+        results.extend(rows)
+        shutil.rmtree(scale_dir, ignore_errors=True)
+    return results
+
+
+def client_row(client_id, i):
+    return [LSAR_DATES[0].strftime("%m/%d/%Y"), 'No', 'OIT', '', f"Load Test {client_id}-{i}", 'On-Prem', '', '', '']
+
+
+def use_coordinator(port, workbook_path):
+    """Client process initializer: talk to the benchmark's coordinator about the generated workbook."""
+    Project_MASTER.COORDINATOR_PORT = port
+    Project_MASTER.WORKBOOK_PATH = workbook_path
+    Project_MASTER._coordinator.clear()  # A forked child inherits the parent's
+    Project_MASTER.session = Project_MASTER.Session()
+
+
+def coordinated_client(client_id, operations, close_folder):
+    """One operator: add operations rows one at a time, then close a project folder. Returns the latency of each call in ms."""
+    latencies = []
+    with redirect_stdout(io.StringIO()):
+        for i in range(operations):
+            start = time.perf_counter()
+            Project_MASTER.record_workbook_changes([{'op': 'append', 'sheet': 'Yes', 'row': client_row(client_id, i)}])
+            latencies.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        Project_MASTER.close_project_rows([close_folder])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def uncoordinated_client(workbook_path, client_id, operations):
+    """One operator the old way: load, append and save the workbook for every row. Returns the number of failed saves."""
+    import openpyxl
+    failures = 0
+    for i in range(operations):
+        try:
+            workbook = openpyxl.load_workbook(workbook_path)
+            workbook['Yes'].append(client_row(client_id, i))
+            workbook.save(workbook_path)
+        except Exception:
+            failures += 1  # Usually a half-written file from another client's save
+    return failures
+
+
+def count_sheet_rows(workbook_path):
+    import openpyxl
+    workbook = openpyxl.load_workbook(workbook_path, read_only=True)
+    try:
+        return {title: workbook[title].max_row - 1 for title in ('Yes', 'Done')}
+    finally:
+        workbook.close()
+
+
+def benchmark_coordinator(clients, operations, scale, work_dir):
+    """N client processes adding rows and closing projects at once, without and then with the write coordinator."""
+    layout = use_synthetic_environment(os.path.join(work_dir, "coordinator"), scale, 1)
+    workbook_path = Project_MASTER.WORKBOOK_PATH
+    pristine_path = workbook_path + '.orig'
+    shutil.copyfile(workbook_path, pristine_path)
+    before = count_sheet_rows(workbook_path)
+    print(f"\n{clients} clients x {operations} new rows each, workbook with {scale} projects")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=clients) as pool:
+        failures = sum(pool.map(uncoordinated_client, [workbook_path] * clients, range(clients), [operations] * clients))
+    elapsed = time.perf_counter() - start
+    try:
+        lost = before['Yes'] + clients * operations - count_sheet_rows(workbook_path)['Yes']
+    except Exception:
+        lost = 'all (workbook unreadable)'
+    print(f"{'Load, append, save per row':<30}{elapsed:>9.2f}s   rows lost: {lost}, failed saves: {failures}")
+
+    # Clients pair up on the same project to close, so half of the closes race each other
+    shutil.copyfile(pristine_path, workbook_path)
+    Project_MASTER.session = Project_MASTER.Session()
+    active = sorted(name for name in layout if layout[name][0] == "Active Projects")
+    close_projects = [active[client_id // 2] for client_id in range(clients)]
+
+    saves = []
+    compact_workbook_journal = Project_MASTER.compact_workbook_journal
+
+    def counting_compaction():
+        applied = compact_workbook_journal()
+        if applied:
+            saves.append(applied)
+        return applied
+
+    Project_MASTER.compact_workbook_journal = counting_compaction
+    server = Project_MASTER.start_write_coordinator(port=0)
+    try:
+        # The coordinator runs on threads of this process; keep its diagnostics out of the table
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=clients, initializer=use_coordinator, initargs=(server.server_address[1], workbook_path)) as pool:
+                latencies = [latency for result in pool.map(coordinated_client, range(clients), [operations] * clients, close_projects) for latency in result]
+            submitted = time.perf_counter() - start
+            Project_MASTER.flush_workbook_changes()
+            elapsed = time.perf_counter() - start
+    finally:
+        with redirect_stdout(io.StringIO()):
+            Project_MASTER.stop_write_coordinator()
+        Project_MASTER.compact_workbook_journal = compact_workbook_journal
+
+    after = count_sheet_rows(workbook_path)
+    closed = len(set(close_projects))
+    lost = before['Yes'] + clients * operations - closed - after['Yes']
+    duplicated = after['Done'] - before['Done'] - closed
+    latencies.sort()
+    print(f"{'Through the coordinator':<30}{elapsed:>9.2f}s   rows lost: {lost}, duplicate closes: {duplicated}")
+    print(f"  {len(latencies)} requests in {submitted:.2f}s: median {statistics.median(latencies):.1f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} ms; {len(saves)} saves for {sum(saves)} changes")
+
+
+def legacy_walk_directory_for_keyword(keyword, directory_path):
+    """The keyword walk before scan_tree: a single os.walk, one folder after another."""
+    matched_folders = []
+    for foldername, subfolders, filenames in os.walk(directory_path):
+        if keyword.lower() in foldername.lower() or any(keyword.lower() in filename.lower() for filename in filenames):
+            matched_folders.append(foldername)
+    return matched_folders
+
+
+@contextmanager
+def share_latency(milliseconds):
+    """Make every os.scandir and os.stat wait milliseconds first, like a round trip to a distant share."""
+    scandir, stat = os.scandir, os.stat
+
+    def slow_scandir(*args, **kwargs):
+        time.sleep(milliseconds / 1000)
+        return scandir(*args, **kwargs)
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(milliseconds / 1000)
+        return stat(*args, **kwargs)
+
+    os.scandir, os.stat = slow_scandir, slow_stat
+    try:
+        yield
+    finally:
+        os.scandir, os.stat = scandir, stat
+
+
+def benchmark_scanner(scale, latency_ms, work_dir):
+    """Keyword walk and index build over a generated tree with simulated share latency, serial and with scan_tree's pool."""
+    layout = use_synthetic_environment(os.path.join(work_dir, "scan"), scale, 1)
+    keyword = sorted(layout)[len(layout) // 2].split('.', 1)[1][:6].lower()
+    base_directory = Project_MASTER.BASE_DIRECTORY
+    print(f"\n{scale} projects ({scale * 2 + 4} folders), {latency_ms} ms per scandir/stat, keyword '{keyword}'")
+    print(f"{'Search':<36}{'Time':>9}{'First match':>14}{'Matches':>9}")
+
+    with share_latency(latency_ms):
+        start = time.perf_counter()
+        expected = legacy_walk_directory_for_keyword(keyword, base_directory)
+        print(f"{'os.walk (before)':<36}{time.perf_counter() - start:>8.2f}s{'':>14}{len(expected):>9}")
+
+        workers = Project_MASTER.SCAN_WORKERS
+        for label, scan_workers in (("scan_tree, 1 thread", 1), (f"scan_tree, {workers} threads", workers)):
+            Project_MASTER.SCAN_WORKERS = scan_workers
+            output = io.StringIO()
+            with redirect_stdout(output):
+                start = time.perf_counter()
+                matched = Project_MASTER.walk_directory_for_keyword(keyword, base_directory)
+                elapsed = time.perf_counter() - start
+            first = re.search(r"first match after (\d+) ms", output.getvalue())
+            assert sorted(matched) == sorted(expected)
+            print(f"{'walk ' + label:<36}{elapsed:>8.2f}s{(first.group(1) + ' ms') if first else '-':>14}{len(matched):>9}")
+
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                Project_MASTER.rebuild_search_index()
+                elapsed = time.perf_counter() - start
+            print(f"{'index build ' + label:<36}{elapsed:>8.2f}s")
+        Project_MASTER.SCAN_WORKERS = workers
+
+
+def legacy_portfolio_summary(workbook_path):
+    """The report the way it was done by hand before --report: walk Yes/Done cell by cell in openpyxl."""
+    import openpyxl
+    workbook = openpyxl.load_workbook(workbook_path, read_only=True)
+    by_agency, by_type, cycle_days = Counter(), Counter(), []
+    for title in ('Yes', 'Done'):
+        rows = workbook[title].iter_rows(values_only=True)
+        headers = {str(name).lower(): i for i, name in enumerate(next(rows))}
+        for row in rows:
+            by_agency[row[headers['agency']]] += 1
+            by_type[str(row[headers['on-prem or off-prem']]).lower()] += 1
+            lsar_date, last_update = row[headers['lsar date']], row[headers['last update']]
+            if title == 'Done' and isinstance(lsar_date, datetime) and isinstance(last_update, datetime) and last_update >= lsar_date:
+                cycle_days.append((last_update - lsar_date).days)
+    workbook.close()
+    return by_agency, by_type, statistics.median(cycle_days) if cycle_days else None
+
+
+def benchmark_report(count, work_dir):
+    """--report over a generated Yes/Done history: openpyxl by hand, then --report on a first run (workbook snapshot
+    included), with the export stale, and with it reused."""
+    projects = synthetic_projects(count)
+    layout = {Project_MASTER.build_formatted_project_name(*project): ("Active Projects" if i % 10 < 6 else "Closed Projects", project)
+              for i, project in enumerate(projects)}
+    workbook_path = os.path.join(work_dir, "Status.xlsx")
+    build_synthetic_workbook(workbook_path, layout)
+    Project_MASTER.WORKBOOK_PATH = workbook_path
+    Project_MASTER.CACHE_DIRECTORY = os.path.join(work_dir, "cache")
+    Project_MASTER.ANALYTICS_DIRECTORY = os.path.join(work_dir, "cache", "analytics")
+
+    print(f"\n{count} projects in Yes/Done")
+    print(f"{'Report':<40}{'Time':>9}")
+    start = time.perf_counter()
+    by_agency, by_type, median = legacy_portfolio_summary(workbook_path)
+    print(f"{'openpyxl loop (before)':<40}{time.perf_counter() - start:>8.3f}s")
+
+    # A first run pays for the workbook snapshot too; after that it is shared with every other command
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        Project_MASTER.read_workbook_sheets(workbook_path)
+        snapshot_elapsed = time.perf_counter() - start
+
+    timings = []
+    for _ in range(2):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            summary = Project_MASTER.summarize_portfolio(Project_MASTER.load_portfolio())
+            timings.append(time.perf_counter() - start)
+    print(f"{'--report, first run':<40}{snapshot_elapsed + timings[0]:>8.3f}s  (workbook snapshot {snapshot_elapsed:.3f}s)")
+    print(f"{'--report, export stale (snapshot cached)':<40}{timings[0]:>8.3f}s")
+    print(f"{'--report, export reused':<40}{timings[1]:>8.3f}s")
+    assert {name: o + c for name, o, c in summary['by_agency']} == dict(by_agency)
+    assert {name: o + c for name, o, c in summary['by_type']} == dict(by_type)
+    assert summary['cycle_days']['median'] == median
+
+
+# Regression checks (the "checks" mode): each sets up its own synthetic environment and asserts on the result
+
+
+def check_row_date_format(work_dir):
+    """write_project_rows keeps the date format openpyxl gives a date, under the highlight style."""
+    import openpyxl
+    use_synthetic_environment(os.path.join(work_dir, "date_format"), 5, 1)
+    workbook = openpyxl.load_workbook(Project_MASTER.WORKBOOK_PATH)
+    sheet = workbook['Yes']
+    Project_MASTER.write_project_rows(sheet, [[LSAR_DATES[0], 'No', 'OIT', '', 'Date Check', 'On-Prem', datetime(2024, 6, 1), '', '']])
+    row = sheet[sheet.max_row]
+    assert row[0].number_format == row[6].number_format == 'yyyy-mm-dd h:mm:ss', (row[0].number_format, row[6].number_format)
+    assert row[0].fill.start_color.rgb.endswith('FFFF00')
+
+
+def check_close_selection(work_dir):
+    """Closing a folder moves only the row that builds its name, and refuses a folder two rows build."""
+    import openpyxl
+    use_synthetic_environment(os.path.join(work_dir, "close"), 5, 1)
+    workbook = openpyxl.load_workbook(Project_MASTER.WORKBOOK_PATH)
+    for agency, division, project_name in (('MVC', '', 'Secure Uploads'), ('DOH', 'IT', 'Secure Uploads'), ('DCA', '', 'Twin'), ('DCA', '', 'Twin')):
+        workbook['Yes'].append([LSAR_DATES[0], 'No', agency, division, project_name, 'On-Prem', datetime(2024, 6, 1), '', ''])
+    workbook.save(Project_MASTER.WORKBOOK_PATH)
+    Project_MASTER.session = Project_MASTER.Session()
+
+    with redirect_stdout(io.StringIO()):
+        moved = Project_MASTER.close_project_rows(['DOH-IT.SecureUploads', 'DCA.Twin'])
+        Project_MASTER.compact_workbook_journal()
+    assert moved == 1, moved
+
+    workbook = openpyxl.load_workbook(Project_MASTER.WORKBOOK_PATH, read_only=True)
+    rows = {title: [row[2:5] for row in workbook[title].iter_rows(min_row=2, values_only=True) if row[4] in ('Secure Uploads', 'Twin')]
+            for title in ('Yes', 'Done')}
+    workbook.close()
+    assert rows['Done'] == [('DOH', 'IT', 'Secure Uploads')], rows['Done']
+    assert sorted(rows['Yes']) == [('DCA', None, 'Twin'), ('DCA', None, 'Twin'), ('MVC', None, 'Secure Uploads')], rows['Yes']
+
+
+def check_coordinator_timeout(work_dir):
+    """A submit the coordinator took but answered too late raises, and the same entries journaled again add one row."""
+    use_synthetic_environment(os.path.join(work_dir, "timeout"), 5, 1)
+    before = count_sheet_rows(Project_MASTER.WORKBOOK_PATH)['Yes']
+    entries = [{'op': 'append', 'sheet': 'Yes', 'row': client_row(0, 0), 'id': 'timeout-check'}]
+
+    handle_request = Project_MASTER.handle_coordinator_request
+
+    def slow_handle_request(request):
+        reply = handle_request(request)
+        time.sleep(1)
+        return reply
+
+    Project_MASTER.handle_coordinator_request = slow_handle_request
+    with redirect_stdout(io.StringIO()):
+        server = Project_MASTER.start_write_coordinator(port=0)
+        try:
+            try:
+                Project_MASTER.coordinator_request({'op': 'submit', 'entries': entries}, address=server.server_address, timeout=0.2)
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("an unanswered submit was treated as answered")
+            time.sleep(1.5)
+            # The same entry journaled a second time, as a client retrying it would
+            Project_MASTER.append_journal_entries(entries)
+            assert len(Project_MASTER.read_workbook_journal()) <= 1
+            Project_MASTER.flush_workbook_changes()
+        finally:
+            Project_MASTER.handle_coordinator_request = handle_request
+            Project_MASTER.stop_write_coordinator()
+    assert count_sheet_rows(Project_MASTER.WORKBOOK_PATH)['Yes'] == before + 1
+
+
+def check_appended_rows_package(work_dir):
+    """save_appended_rows writes a package that passes testzip() and reopens with the new rows."""
+    import zipfile
+    import openpyxl
+    use_synthetic_environment(os.path.join(work_dir, "append"), 5, 1)
+    saved = []
+    save_appended_rows = Project_MASTER.save_appended_rows
+    Project_MASTER.save_appended_rows = lambda *args: saved.append(save_appended_rows(*args)) or saved[-1]
+    try:
+        with redirect_stdout(io.StringIO()):
+            # The first compaction adds the highlight style and journal property; the second can patch the XML
+            for i in range(2):
+                Project_MASTER.record_workbook_changes([{'op': 'append', 'sheet': 'Yes', 'row': client_row(1, i)}])
+                Project_MASTER.compact_workbook_journal()
+    finally:
+        Project_MASTER.save_appended_rows = save_appended_rows
+    assert saved[-1], "the second batch of rows did not take the XML patching path"
+
+    with zipfile.ZipFile(Project_MASTER.WORKBOOK_PATH) as package:
+        assert package.testzip() is None
+    workbook = openpyxl.load_workbook(Project_MASTER.WORKBOOK_PATH)
+    assert [cell.value for cell in workbook['Yes'][workbook['Yes'].max_row]][4] == client_row(1, 1)[4]
+
+
+def run_regression_checks(work_dir):
+    checks = [check_row_date_format, check_close_selection, check_coordinator_timeout, check_appended_rows_package]
+    for check in checks:
+        start = time.perf_counter()
+        check(work_dir)
+        print(f"{check.__name__:<40}ok  {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project_MASTER benchmarks")
+    parser.add_argument("benchmark", choices=["docx", "trigram", "workflows", "rows", "coordinator", "scan", "report", "checks"], help="Which benchmark to run")
+    parser.add_argument("--count", type=int, default=500, help="Number of projects (or names, for trigram)")
+    parser.add_argument("--scales", default="100,1000", help="workflows: comma-separated project/row counts to generate")
+    parser.add_argument("--operations", type=int, default=20, help="workflows: searches, creates and closes timed per scale; coordinator: rows per client")
+    parser.add_argument("--file-kb", type=int, default=4, help="workflows: size of each generated project file")
+    parser.add_argument("--clients", type=int, default=8, help="coordinator: concurrent client processes")
+    parser.add_argument("--latency-ms", type=float, default=5, help="scan: simulated round trip per folder listing")
+    parser.add_argument("--json", help="workflows: also write the results to this JSON file")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="project_master_bench_")
+    try:
+        if args.benchmark == "docx":
+            benchmark_status_sheets(args.count, work_dir)
+        elif args.benchmark == "trigram":
+            benchmark_trigram_search(args.count)
+        elif args.benchmark == "rows":
+            benchmark_row_writer(args.count, work_dir)
+        elif args.benchmark == "report":
+            benchmark_report(args.count, work_dir)
+        elif args.benchmark == "scan":
+            benchmark_scanner(args.count, args.latency_ms, work_dir)
+        elif args.benchmark == "checks":
+            run_regression_checks(work_dir)
+        elif args.benchmark == "coordinator":
+            benchmark_coordinator(args.clients, args.operations, args.count, work_dir)
+        elif args.benchmark == "workflows":
+            results = benchmark_workflows([int(scale) for scale in args.scales.split(',')], args.operations, args.file_kb, work_dir)
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as file:
+                    json.dump(results, file, indent=2)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,22 @@
 import os
+import sys
 import shutil
 import glob
+import hashlib
+import platform
+import subprocess
+import time
+import zipfile
+from contextlib import contextmanager
+
+# Files bundled next to the executable (read through sys._MEIPASS when frozen); config.ini is the one prepared for the location
+DATA_FILES = ["config.ini", "email_body.html", "PSAR_email_body.html", "Cloud_IR_email_body.html", "Project_MASTER.py"]
+DIST_DIRECTORY = "Project_MASTER"
+WORK_DIRECTORY = "build"  # PyInstaller's analysis cache, kept between builds
+INPUT_HASH_PATH = os.path.join(WORK_DIRECTORY, "input_hash.txt")
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # Fixed timestamp so the same build always zips to the same bytes
+
+step_timings = []
 
 def determine_location():
     while True:
@@ -12,20 +28,112 @@ def determine_location():
         else:
             print("Invalid input. Please enter 'h' for home or 'w' for work.")
 
+@contextmanager
+def timed_step(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        step_timings.append((name, elapsed))
+        print(f"{name}: {elapsed:.2f}s")
+
+def print_build_timings():
+    print("\nBuild timings:")
+    for name, elapsed in step_timings:
+        print(f"  {name:<28}{elapsed:>8.2f}s")
+    print(f"  {'Total':<28}{sum(elapsed for _, elapsed in step_timings):>8.2f}s")
+
 def cleanup_after_build():
     # Delete the Project_MASTER directory
-    if os.path.exists("Project_MASTER"):
-        shutil.rmtree("Project_MASTER")
+    if os.path.exists(DIST_DIRECTORY):
+        shutil.rmtree(DIST_DIRECTORY)
 
     # Delete the build directory
-    if os.path.exists("build"):
-        shutil.rmtree("build")
+    if os.path.exists(WORK_DIRECTORY):
+        shutil.rmtree(WORK_DIRECTORY)
 
     # Delete the Project_MASTER.spec file
     spec_file = "Project_MASTER.spec"
     if os.path.isfile(spec_file):
         os.remove(spec_file)
 
+def pyinstaller_version():
+    try:
+        from importlib.metadata import version
+        return version("pyinstaller")
+    except Exception:
+        return "unknown"
+
+def hash_build_inputs(command):
+    """sha256 over everything that changes the executable: the bundled files, the command line, Python and PyInstaller."""
+    digest = hashlib.sha256()
+    for part in [" ".join(command), platform.python_version(), pyinstaller_version()]:
+        digest.update(part.encode("utf-8") + b"\0")
+    for path in DATA_FILES:
+        digest.update(path.encode("utf-8") + b"\0")
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def build_is_current(input_hash):
+    """True if the last successful build used the same inputs and its output is still there."""
+    if not os.path.isdir(os.path.join(DIST_DIRECTORY, "Project_MASTER")):
+        return False
+    try:
+        with open(INPUT_HASH_PATH, encoding="utf-8") as file:
+            return file.read().strip() == input_hash
+    except OSError:
+        return False
+
+def run_pyinstaller(command, input_hash):
+    # Without --clean PyInstaller reuses the analysis in build/, so only changed modules are reprocessed
+    result = subprocess.run(command)
+    if result.returncode != 0:
+        raise RuntimeError(f"PyInstaller failed with exit code {result.returncode}")
+    with open(INPUT_HASH_PATH, "w", encoding="utf-8") as file:
+        file.write(input_hash)
+
+def write_deterministic_zip(zip_path, source_directory):
+    """Zip source_directory with sorted entries, fixed timestamps and permissions, so unchanged builds give identical zips."""
+    entries = []
+    for root, dirs, files in os.walk(source_directory):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            entries.append((os.path.relpath(path, source_directory).replace(os.sep, "/"), path))
+
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for arcname, path in sorted(entries):
+            if os.path.isdir(path):
+                info = zipfile.ZipInfo(arcname + "/", ZIP_DATE_TIME)
+                info.external_attr = (0o40755 << 16) | 0x10
+                archive.writestr(info, b"")
+            else:
+                info = zipfile.ZipInfo(arcname, ZIP_DATE_TIME)
+                info.external_attr = 0o100644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, "rb") as source, archive.open(info, "w") as destination:
+                    shutil.copyfileobj(source, destination, 1024 * 1024)
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def latest_zip(directory):
+    """The highest-numbered Project_MASTER*.zip in directory, or None."""
+    base_name = "Project_MASTER"
+    latest, latest_index = None, -1
+    for zip_file in glob.glob(os.path.join(directory, f"{base_name}*.zip")):
+        stripped_name = os.path.basename(zip_file).replace(base_name, '').replace('.zip', '')
+        index = 0 if stripped_name == "" else int(stripped_name) if stripped_name.isdigit() else -1
+        if index > latest_index:
+            latest, latest_index = zip_file, index
+    return latest
+
 def determine_zip_name(directory):
     base_name = "Project_MASTER"
     zip_files = glob.glob(os.path.join(directory, f"{base_name}*.zip"))
@@ -43,18 +151,28 @@ def determine_zip_name(directory):
 
 def build_app(location):
     # Step 0: Prepare the appropriate config file
-    if location == "home":
-        shutil.copy("config.ini", "config_temp.ini")
-    elif location == "work":
-        shutil.copy("config_work.ini", "config.ini")
-
-    # Step 1: Build the PyInstaller executable
-    command = "pyinstaller --add-data=\"config.ini;.\" --add-data=\"email_body.html;.\" --add-data=\"Project_MASTER.py;.\" --distpath=Project_MASTER Project_MASTER.py"
-    os.system(command)
+    with timed_step("Prepare config"):
+        if location == "home":
+            shutil.copy("config.ini", "config_temp.ini")
+        elif location == "work":
+            shutil.copy("config_work.ini", "config.ini")
 
-    # Restore original config.ini if we're in home location
-    if location == "home":
-        shutil.move("config_temp.ini", "config.ini")
+    # Step 1: Build the PyInstaller executable, unless nothing it is built from has changed
+    command = ["pyinstaller", "--noconfirm", f"--workpath={WORK_DIRECTORY}", f"--distpath={DIST_DIRECTORY}"]
+    command += [f"--add-data={path}{os.pathsep}." for path in DATA_FILES]
+    command.append("Project_MASTER.py")
+    try:
+        with timed_step("Hash inputs"):
+            input_hash = hash_build_inputs(command)
+        if build_is_current(input_hash):
+            print("Sources, config and email bodies are unchanged since the last build; skipping PyInstaller.")
+        else:
+            with timed_step("PyInstaller"):
+                run_pyinstaller(command, input_hash)
+    finally:
+        # Restore original config.ini if we're in home location
+        if location == "home":
+            shutil.move("config_temp.ini", "config.ini")
 
     # Determine the unique zip_name before zipping
     if location == "work":
@@ -65,7 +183,17 @@ def build_app(location):
         zip_name = determine_zip_name(directory)  # Use the function to determine the name even in the "home" location
     
     # Step 2: Zip the Project_MASTER directory
-    shutil.make_archive(zip_name.replace(".zip", ""), 'zip', "Project_MASTER")
+    previous_zip = latest_zip(directory)
+    with timed_step("Zip"):
+        write_deterministic_zip(zip_name, DIST_DIRECTORY)
+
+    # An identical zip means an identical build, so don't publish another numbered copy of it
+    if previous_zip and file_digest(previous_zip) == file_digest(zip_name):
+        print(f"{zip_name} is identical to {os.path.basename(previous_zip)}; keeping the existing zip.")
+        os.remove(zip_name)
+        print_build_timings()
+        return
+
     print(f"Moving {zip_name} to {directory}")
 
     current_directory = os.getcwd()
@@ -76,14 +204,18 @@ def build_app(location):
         # We don't need to do anything else in this case
     else:
         # Move the zip file to the desired location
-        try:
-            shutil.move(zip_name, directory)
-        except Exception as e:
-            print(f"Error occurred while moving the file: {e}")
+        with timed_step("Move zip"):
+            try:
+                shutil.move(zip_name, directory)
+            except Exception as e:
+                print(f"Error occurred while moving the file: {e}")
 
-    # Cleanup build directories and files for "work" location
-    if location == "work":
-        cleanup_after_build()
+    print_build_timings()
 
-location = determine_location()
-build_app(location)
\ No newline at end of file
+# The build cache and output are kept so the next build can be skipped or reuse PyInstaller's analysis; --clean removes them
+if "--clean" in sys.argv[1:]:
+    cleanup_after_build()
+    print("Removed the build cache and output.")
+else:
+    location = determine_location()
+    build_app(location)